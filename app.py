@@ -4,13 +4,26 @@ Unified GUI with PDF generation, validation, and backups.
 """
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 import os
 import sqlite3
 from db import service
 from db.init import initialize_database
 import pdf_generator
 
+# Rows fetched per page by the paged list views
+TREE_PAGE_SIZE = 200
+
+# How often the Tk thread checks on a list query running in the background
+BACKGROUND_POLL_MS = 20
+
+# Search boxes re-filter once typing pauses for this long
+SEARCH_DEBOUNCE_MS = 250
+
+# Picker follow-ups (boats for a customer, a mechanic's rate) wait this long for changes to settle
+PICKER_DEBOUNCE_MS = 80
+
 
 class CajunMarineApp:
     """Main application window with unified navigation."""
@@ -21,6 +34,10 @@ class CajunMarineApp:
         self.root.geometry("1200x800")
         self.root.configure(bg='#1a3a52')
         
+        # List queries run here so a slow read doesn't freeze the window;
+        # each worker thread gets its own service connection
+        self.db_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='db')
+        
         # Ensure database exists
         # Run unified initializer (idempotent migrations + defaults)
         try:
@@ -46,19 +63,112 @@ class CajunMarineApp:
             return None
         return tree.item(selection[0])['values'][0]
     
+    @staticmethod
+    def choice_id(text, choice_ids):
+        """Id behind a picker's "id - ..." text: looked up in choice_ids (label -> id), else parsed."""
+        choice = choice_ids.get(text)
+        return choice if choice is not None else int(text.split(' - ')[0])
+    
+    def fill_tree(self, tree, rows, tags=None):
+        """Replace all rows in a Treeview with the given value tuples."""
+        if hasattr(tree, 'next_page'):
+            tree.next_page = None  # stop any paging from an earlier fill_tree_paged
+        tree.pending_load = None  # and drop a page still being fetched
+        tree.delete(*tree.get_children())
+        self.append_tree_rows(tree, rows, tags)
+    
+    def append_tree_rows(self, tree, rows, tags=None):
+        """Append value tuples to a Treeview; tags, if given, holds each row's tag tuple."""
+        insert = tree.insert
+        if tags is None:
+            for values in rows:
+                insert('', 'end', values=values)
+        else:
+            for values, row_tags in zip(rows, tags):
+                insert('', 'end', values=values, tags=row_tags)
+    
+    def debounce(self, widget, action, delay=SEARCH_DEBOUNCE_MS):
+        """Run action once calls for widget stop arriving for delay ms; each call restarts the wait."""
+        pending = getattr(widget, 'pending_debounce', None)
+        if pending is not None:
+            widget.after_cancel(pending)
+        
+        def run():
+            widget.pending_debounce = None
+            if widget.winfo_exists():
+                action()
+        
+        widget.pending_debounce = widget.after(delay, run)
+    
+    def load_in_background(self, tree, fetch, populate):
+        """Run fetch() on a worker thread, then populate(result) on the Tk thread.
+        
+        A newer load on the same tree supersedes this one, and nothing happens if
+        the tree was destroyed (view changed) before the query finished.
+        """
+        future = self.db_pool.submit(fetch)
+        tree.pending_load = future
+        
+        def check():
+            if not future.done():
+                self.root.after(BACKGROUND_POLL_MS, check)
+                return
+            if getattr(tree, 'pending_load', None) is not future or not tree.winfo_exists():
+                return
+            tree.pending_load = None
+            try:
+                result = future.result()
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to load data: {e}")
+                return
+            populate(result)
+        
+        self.root.after(BACKGROUND_POLL_MS, check)
+    
+    def fill_tree_paged(self, tree, fetch_page, row_fn):
+        """Fill a Treeview a page at a time, fetching the next page when the view reaches the end.
+        
+        fetch_page(limit, offset) returns a list of records and runs on a worker thread
+        (see load_in_background); row_fn turns one record into tree values on the Tk thread.
+        """
+        if not hasattr(tree, 'next_page'):
+            # Hook the scroll notifications once per tree, still forwarding them to the scrollbar
+            forward = tree.tk.splitlist(tree.cget('yscrollcommand'))
+            
+            def on_scroll(first, last):
+                if forward:
+                    tree.tk.call(*forward, first, last)
+                if float(last) >= 1.0 and tree.next_page:
+                    tree.next_page()
+            
+            tree.configure(yscrollcommand=on_scroll)
+        
+        offset = 0
+        
+        def next_page():
+            # Cleared until this page lands, so scrolling can't request the same offset twice
+            tree.next_page = None
+            start = offset
+            
+            def populate(records):
+                nonlocal offset
+                offset = start + len(records)
+                self.append_tree_rows(tree, map(row_fn, records))
+                if len(records) == TREE_PAGE_SIZE:
+                    tree.next_page = next_page
+            
+            self.load_in_background(tree, lambda: fetch_page(TREE_PAGE_SIZE, start), populate)
+        
+        tree.next_page = None
+        tree.delete(*tree.get_children())
+        next_page()
+    
     def fetch_boat_by_id(self, boat_id):
         """Fetch boat details from database. Returns dict or None."""
         if not boat_id:
             return None
         try:
-            conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-            conn.row_factory = sqlite3.Row
-            cur = conn.cursor()
-            cur.execute("SELECT * FROM Boats WHERE boat_id = ?", (boat_id,))
-            row = cur.fetchone()
-            result = dict(row) if row else None
-            conn.close()
-            return result
+            return service.get_boat(boat_id)
         except Exception:
             return None
     
@@ -67,14 +177,7 @@ class CajunMarineApp:
         if not engine_id:
             return None
         try:
-            conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-            conn.row_factory = sqlite3.Row
-            cur = conn.cursor()
-            cur.execute("SELECT * FROM Engines WHERE engine_id = ?", (engine_id,))
-            row = cur.fetchone()
-            result = dict(row) if row else None
-            conn.close()
-            return result
+            return service.get_engine(engine_id)
         except Exception:
             return None
     
@@ -86,9 +189,8 @@ class CajunMarineApp:
             boat_combo['state'] = 'disabled'
             return
         
-        boats = service.get_customer_boats(customer_id)
-        if boats:
-            boat_choices = [f"{b['boat_id']} - {b.get('year', 'N/A')} {b.get('make', '')} {b.get('model', '')}" for b in boats]
+        boat_choices = [label for _, label in service.list_boat_choices(customer_id)]
+        if boat_choices:
             boat_combo['values'] = boat_choices
             boat_combo['state'] = 'readonly'
         else:
@@ -104,9 +206,8 @@ class CajunMarineApp:
             engine_combo['state'] = 'disabled'
             return
         
-        engines = service.get_boat_engines(boat_id)
-        if engines:
-            engine_choices = [f"{e['engine_id']} - {e.get('make', '')} {e.get('model', '')} ({e.get('hp', 'N/A')} HP)" for e in engines]
+        engine_choices = [label for _, label in service.list_engine_choices(boat_id)]
+        if engine_choices:
             engine_combo['values'] = engine_choices
             engine_combo['state'] = 'readonly'
         else:
@@ -220,8 +321,8 @@ class CajunMarineApp:
         tree.column('Days', width=100)
         
         for e in engines:
-            install_date = datetime.strptime(e['date_installed'], '%Y-%m-%d')
-            days_overdue = (datetime.now() - install_date).days - 30
+            install_date = date.fromisoformat(e['date_installed'])
+            days_overdue = (date.today() - install_date).days - 30
             tree.insert('', 'end', values=(
                 e['hp'],
                 e['model'],
@@ -258,15 +359,16 @@ class CajunMarineApp:
         
         # Get some quick stats
         try:
-            customers = service.list_customers()
-            tickets = service.list_tickets()
-            open_tickets = [t for t in tickets if t['status'] != 'Closed']
-            engines = service.list_new_engines('In Stock')
-            engines_needing_reg = service.get_engines_needing_registration()
+            # One read transaction: a single snapshot for all four figures
+            with service.read_snapshot():
+                customers = service.count_customers()
+                open_tickets = service.count_open_tickets()
+                engines = service.count_engines('In Stock')
+                engines_needing_reg = service.get_engines_needing_registration()
             
-            self.create_metric_card(metrics, "Total Customers", len(customers), 0, 0)
-            self.create_metric_card(metrics, "Open Tickets", len(open_tickets), 0, 1)
-            self.create_metric_card(metrics, "Engines In Stock", len(engines), 1, 0)
+            self.create_metric_card(metrics, "Total Customers", customers, 0, 0)
+            self.create_metric_card(metrics, "Open Tickets", open_tickets, 0, 1)
+            self.create_metric_card(metrics, "Engines In Stock", engines, 1, 0)
             self.create_metric_card(metrics, "Engines Need Registration", len(engines_needing_reg), 1, 1, 
                                   bg='#ff6b6b' if len(engines_needing_reg) > 0 else '#5cb85c')
         except Exception as e:
@@ -334,7 +436,7 @@ class CajunMarineApp:
         search_var = tk.StringVar()
         search_entry = tk.Entry(search_frame, textvariable=search_var, width=40)
         search_entry.pack(side='left')
-        search_var.trace('w', lambda *args: self.filter_customers(tree, search_var.get()))
+        search_var.trace('w', lambda *args: self.debounce(tree, lambda: self.filter_customers(tree, search_var.get())))
         
         # Customers tree
         tree_frame = tk.Frame(self.content_frame)
@@ -379,31 +481,29 @@ class CajunMarineApp:
     
     def load_customers(self, tree):
         """Load customers into tree."""
-        tree.delete(*tree.get_children())
-        customers = service.list_customers()
-        
-        # Sort customers based on current sort settings
+        # Sort customers based on current sort settings (SQLite does the sorting)
         col_map = {'ID': 'customer_id', 'Name': 'name', 'Phone': 'phone', 'Email': 'email', 
                    'Tax Exempt': 'tax_exempt', 'Out of State': 'out_of_state'}
         sort_key = col_map.get(self.customer_sort_column, 'name')
-        
-        # Handle different data types for sorting
-        if sort_key in ('customer_id', 'tax_exempt', 'out_of_state'):
-            # Numeric fields
-            customers.sort(key=lambda x: (x.get(sort_key) or 0), reverse=self.customer_sort_reverse)
-        else:
-            # String fields
-            customers.sort(key=lambda x: (x.get(sort_key) or '').lower(), reverse=self.customer_sort_reverse)
-        
-        for c in customers:
-            tree.insert('', 'end', values=(
-                c['customer_id'],
-                c['name'],
-                c.get('phone') or '',
-                c.get('email') or '',
-                'Yes' if c.get('tax_exempt') else 'No',
-                'Yes' if c.get('out_of_state') else 'No'
-            ))
+        reverse = self.customer_sort_reverse
+        
+        def fetch():
+            customers = service.list_customers(order_by=sort_key, descending=reverse)
+            return [self.customer_row(c) for c in customers]
+        
+        self.load_in_background(tree, fetch, lambda rows: self.fill_tree(tree, rows))
+    
+    @staticmethod
+    def customer_row(c):
+        """Customer tree values for one customer."""
+        return (
+            c['customer_id'],
+            c['name'],
+            c.get('phone') or '',
+            c.get('email') or '',
+            'Yes' if c.get('tax_exempt') else 'No',
+            'Yes' if c.get('out_of_state') else 'No'
+        )
     
     def sort_customers(self, tree, column):
         """Sort customers by column."""
@@ -427,21 +527,17 @@ class CajunMarineApp:
     
     def filter_customers(self, tree, search_term):
         """Filter customers by search term."""
-        tree.delete(*tree.get_children())
-        customers = service.list_customers()
         search_lower = search_term.lower()
-        for c in customers:
-            if (search_lower in c['name'].lower() or 
-                search_lower in (c.get('phone') or '').lower() or
-                search_lower in (c.get('email') or '').lower()):
-                tree.insert('', 'end', values=(
-                    c['customer_id'],
-                    c['name'],
-                    c.get('phone') or '',
-                    c.get('email') or '',
-                    'Yes' if c.get('tax_exempt') else 'No',
-                    'Yes' if c.get('out_of_state') else 'No'
-                ))
+        
+        def fetch():
+            return [
+                self.customer_row(c) for c in service.list_customers()
+                if (search_lower in c['name'].lower() or 
+                    search_lower in (c.get('phone') or '').lower() or
+                    search_lower in (c.get('email') or '').lower())
+            ]
+        
+        self.load_in_background(tree, fetch, lambda rows: self.fill_tree(tree, rows))
     
     def import_customers_from_excel(self, tree):
         """Import customers from Excel file."""
@@ -611,16 +707,19 @@ class CajunMarineApp:
                 return
             
             try:
-                service.update_customer(
-                    customer_id,
-                    name=name,
-                    phone=phone_entry.get().strip() or None,
-                    email=email_entry.get().strip() or None,
-                    address=address_text.get('1.0', 'end').strip() or None,
-                    tax_exempt=tax_exempt_var.get(),
-                    tax_exempt_certificate=cert_entry.get().strip() or None,
-                    out_of_state=out_of_state_var.get()
-                )
+                # Save the customer and refresh their ticket totals (tax status) in one commit
+                with service.transaction():
+                    service.update_customer(
+                        customer_id,
+                        name=name,
+                        phone=phone_entry.get().strip() or None,
+                        email=email_entry.get().strip() or None,
+                        address=address_text.get('1.0', 'end').strip() or None,
+                        tax_exempt=tax_exempt_var.get(),
+                        tax_exempt_certificate=cert_entry.get().strip() or None,
+                        out_of_state=out_of_state_var.get()
+                    )
+                    service.recalculate_customer_tickets(customer_id)
                 messagebox.showinfo("Success", "Customer updated successfully")
                 dialog.destroy()
                 self.show_customers()  # Refresh
@@ -768,52 +867,27 @@ class CajunMarineApp:
         tree.bind('<Button-1>', on_tree_click)
     
     def load_tickets(self, tree, status_filter):
-        """Load tickets into tree."""
-        tree.delete(*tree.get_children())
-        
-        if status_filter == "All":
-            tickets = service.list_tickets()
-        else:
-            tickets = service.list_tickets(status_filter)
-
-        # Ensure totals are accurate and gather engine summary
-        for t in tickets:
-            try:
-                service.calculate_ticket_totals(t['ticket_id'])
-            except Exception:
-                pass
-            # Fetch up-to-date details for description and engine
-            try:
-                details = service.get_ticket_details(t['ticket_id'])
-            except Exception:
-                details = t
-            if details is None:
-                details = {}
-            engine_summary = 'N/A'
-            if details.get('engine_id'):
-                eng_type = details.get('engine_type') or details.get('engine') or ''
-                eng_make = details.get('engine_make', '')
-                eng_model = details.get('engine_model', '')
-                eng_hp = details.get('engine_hp', '')
-                eng_year = details.get('engine_year', '')
-                eng_outdrive = details.get('engine_outdrive', '')
-                # Format: Year Make Model HP Type (Outdrive if sterndrive)
-                parts = [str(eng_year), eng_make, eng_model, f"{eng_hp}HP" if eng_hp else '', eng_type]
-                if eng_type and 'sterndrive' in eng_type.lower() and eng_outdrive:
-                    parts.append(f"({eng_outdrive})")
-                engine_summary = ' '.join(p for p in parts if p).strip()
-                engine_summary = ' '.join(engine_summary.split())  # normalize spaces
-
-            tree.insert('', 'end', values=(
-                t['ticket_id'],
-                t.get('customer_name', 'N/A'),
-                f"{t.get('boat_make', '')} {t.get('boat_model', '')}".strip() or 'N/A',
-                engine_summary,
-                ((details.get('description') or '') if isinstance(details.get('description', ''), str) else str(details.get('description', ''))).strip()[:120],
-                t['status'],
-                t['date_opened'],
-                f"${(details.get('total', t.get('total', 0)) or 0):.2f}"
-            ))
+        """Load tickets into tree, a page at a time as the list is scrolled."""
+        status = None if status_filter == "All" else status_filter
+        
+        # Stored totals are recalculated whenever parts or labor change, so
+        # scrolling the list only reads
+        self.fill_tree_paged(tree, lambda limit, offset: service.list_tickets(status, limit, offset),
+                             self.ticket_row)
+    
+    @staticmethod
+    def ticket_row(t):
+        """Tickets tree values for one ticket."""
+        return (
+            t['ticket_id'],
+            t['customer_name'],
+            t['boat_label'],
+            t['engine_summary'],
+            t['description_summary'],
+            t['status'],
+            t['date_opened'],
+            f"${(t.get('total') or 0):.2f}"
+        )
     
     def add_ticket_dialog(self):
         """Show add ticket dialog."""
@@ -822,8 +896,8 @@ class CajunMarineApp:
         dialog.geometry("500x400")
         
         tk.Label(dialog, text="Customer:*").grid(row=0, column=0, sticky='e', padx=5, pady=5)
-        customers = service.list_customers()
-        customer_choices = [f"{c['customer_id']} - {c['name']}" for c in customers]
+        customer_ids = {label: customer_id for customer_id, label in service.list_customer_choices()}
+        customer_choices = list(customer_ids)
         customer_var = tk.StringVar()
         # Frame to hold customer combobox and quick-add button
         customer_frame = tk.Frame(dialog)
@@ -859,22 +933,18 @@ class CajunMarineApp:
         
         def update_boats(*args):
             if customer_var.get():
-                customer_id = int(customer_var.get().split(' - ')[0])
+                customer_id = self.choice_id(customer_var.get(), customer_ids)
                 # Get boats for this customer
                 boats = []
                 try:
-                    conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-                    cur = conn.cursor()
-                    cur.execute("SELECT boat_id, year, make, model FROM Boats WHERE customer_id = ?", (customer_id,))
-                    boats = [f"{b[0]} - {b[1]} {b[2]} {b[3]}" for b in cur.fetchall()]
-                    conn.close()
+                    boats = [label for _, label in service.list_boat_choices(customer_id)]
                 except:
                     pass
                 boat_combo['values'] = boats
                 if boats:
                     boat_combo.current(0)
         
-        customer_var.trace('w', update_boats)
+        customer_var.trace('w', lambda *args: self.debounce(customer_combo, update_boats, PICKER_DEBOUNCE_MS))
         
         # Engine selection (optional) with quick-add
         tk.Label(dialog, text="Engine (Optional):").grid(row=2, column=0, sticky='e', padx=5, pady=5)
@@ -900,16 +970,12 @@ class CajunMarineApp:
                 boat_id = int(boat_var.get().split(' - ')[0])
                 engines = []
                 try:
-                    conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-                    cur = conn.cursor()
-                    cur.execute("SELECT engine_id, engine_type, make, model, hp FROM Engines WHERE boat_id = ?", (boat_id,))
-                    engines = [f"{e[0]} - {e[2]} {e[3]} ({e[4]} HP {e[1] if e[1] else ''})" for e in cur.fetchall()]
-                    conn.close()
+                    engines = [label for _, label in service.list_engine_choices(boat_id)]
                 except:
                     pass
                 engine_combo['values'] = engines
         
-        boat_var.trace('w', update_engines)
+        boat_var.trace('w', lambda *args: self.debounce(boat_combo, update_engines, PICKER_DEBOUNCE_MS))
         
         tk.Label(dialog, text="Description:").grid(row=3, column=0, sticky='ne', padx=5, pady=5)
         desc_text = tk.Text(dialog, width=40, height=8)
@@ -921,7 +987,7 @@ class CajunMarineApp:
                 return
             
             try:
-                customer_id = int(customer_var.get().split(' - ')[0])
+                customer_id = self.choice_id(customer_var.get(), customer_ids)
                 boat_id = int(boat_var.get().split(' - ')[0])
                 engine_id = int(engine_var.get().split(' - ')[0]) if engine_var.get() else None
                 description = desc_text.get('1.0', 'end').strip() or None
@@ -1030,8 +1096,8 @@ class CajunMarineApp:
         tk.Label(left, text=(eng_line or 'N/A'), font=('Segoe UI', 10), bg='white').grid(row=6, column=0, sticky='w', padx=10, pady=(0,10))
 
         # Middle: Totals including Parts/Labor totals
-        parts_total = sum([(p.get('quantity_used') or 0) * (p.get('price') or 0.0) for p in (ticket.get('parts') or [])])
-        labor_total = sum([(l.get('hours_worked') or 0.0) * (l.get('labor_rate') or 0.0) for l in (ticket.get('labor') or [])])
+        parts_total = sum(p['line_total'] for p in (ticket.get('parts') or []))
+        labor_total = sum(l['labor_total'] for l in (ticket.get('labor') or []))
         tk.Label(middle, text='Totals', font=('Segoe UI', 12, 'bold'), bg='white').grid(row=0, column=0, sticky='w', padx=10, pady=(10,0))
         totals = tk.Frame(middle, bg='white')
         totals.grid(row=1, column=0, sticky='nw', padx=10, pady=(0,10))
@@ -1054,15 +1120,13 @@ class CajunMarineApp:
         parts_scroll = ttk.Scrollbar(parts_table_frame, orient='vertical', command=parts_tree.yview)
         parts_scroll.pack(side='right', fill='y')
         parts_tree.configure(yscrollcommand=parts_scroll.set)
-        for part in ticket.get('parts', []):
-            total = part['quantity_used'] * part['price']
-            item_id = parts_tree.insert('', 'end', values=(
-                part['part_name'],
-                part['quantity_used'],
-                f"${part['price']:.2f}",
-                f"${total:.2f}"
-            ))
-            parts_tree.item(item_id, tags=(part['ticket_part_id'],))
+        parts = ticket.get('parts', [])
+        self.append_tree_rows(parts_tree, [(
+            part['part_name'],
+            part['quantity_used'],
+            f"${part['price']:.2f}",
+            f"${part['line_total']:.2f}"
+        ) for part in parts], [(part['ticket_part_id'],) for part in parts])
         parts_btn_frame = tk.Frame(right, bg='white')
         parts_btn_frame.pack(padx=10, pady=(0,10), anchor='w')
         tk.Button(parts_btn_frame, text="➕ Add Part", 
@@ -1130,16 +1194,14 @@ class CajunMarineApp:
         labor_tree.column('Rate', width=80, anchor='e')
         labor_tree.column('Total', width=90, anchor='e')
         labor_tree.column('Description', width=260)
-        for labor in ticket.get('labor', []):
-            total = labor['hours_worked'] * labor['labor_rate']
-            item_id = labor_tree.insert('', 'end', values=(
-                labor['mechanic_name'],
-                labor['hours_worked'],
-                f"${labor['labor_rate']:.2f}",
-                f"${total:.2f}",
-                (labor.get('work_description') or '')[:40]
-            ))
-            labor_tree.item(item_id, tags=(labor['assignment_id'],))
+        labor_rows = ticket.get('labor', [])
+        self.append_tree_rows(labor_tree, [(
+            labor['mechanic_name'],
+            labor['hours_worked'],
+            f"${labor['labor_rate']:.2f}",
+            f"${labor['labor_total']:.2f}",
+            labor['work_summary']
+        ) for labor in labor_rows], [(labor['assignment_id'],) for labor in labor_rows])
         labor_btns = tk.Frame(labor_card, bg='white')
         labor_btns.pack(anchor='w', padx=10, pady=(0,10))
         tk.Button(labor_btns, text="➕ Add Labor", command=lambda: self.add_labor_to_ticket(ticket_id, dialog), bg='#5cb85c', fg='white').pack(side='left', padx=5)
@@ -1166,13 +1228,7 @@ class CajunMarineApp:
         deposits_tree.column('Amount', width=100, anchor='e')
         deposits_tree.column('Method', width=120)
         deposits_tree.column('Notes', width=220)
-        for dep in deposits:
-            deposits_tree.insert('', 'end', values=(
-                dep['payment_date'],
-                f"${dep['amount']:.2f}",
-                dep.get('payment_method') or 'N/A',
-                (dep.get('notes') or '')[:40]
-            ))
+        self.append_tree_rows(deposits_tree, map(self.deposit_row, deposits))
         tk.Button(payments_card, text="💵 Add Payment", command=lambda: self.add_deposit_to_ticket(ticket_id, dialog), bg='#5cb85c', fg='white').pack(anchor='w', padx=10, pady=(0,10))
 
         # Ensure canvas computes layout and becomes scrollable
@@ -1191,6 +1247,16 @@ class CajunMarineApp:
         tk.Button(btn_frame, text="Close", command=dialog.destroy, font=('Segoe UI', 10)).pack(side='left', padx=5)
 
     # ===== Helper methods for ticket details deletion =====
+    @staticmethod
+    def deposit_row(dep):
+        """Payments tree values for one deposit."""
+        return (
+            dep['payment_date'],
+            f"${dep['amount']:.2f}",
+            dep.get('payment_method') or 'N/A',
+            (dep.get('notes') or '')[:40]
+        )
+    
     def _delete_selected_part(self, parts_tree, ticket_id, parent_dialog):
         selection = parts_tree.selection()
         if not selection:
@@ -1237,12 +1303,8 @@ class CajunMarineApp:
         dialog.geometry("400x200")
         
         tk.Label(dialog, text="Part:*").grid(row=0, column=0, sticky='e', padx=5, pady=5)
-        parts = service.list_parts()
-        part_choices = [
-            f"{p['part_id']} - {p['name']}" +
-            (f" (PN: {p['part_number']})" if p.get('part_number') else "") +
-            f" (${p['price']:.2f})" for p in parts
-        ]
+        part_ids = {label: part_id for part_id, label in service.list_part_choices(with_part_number=True)}
+        part_choices = list(part_ids)
         part_var = tk.StringVar()
         part_combo = ttk.Combobox(dialog, textvariable=part_var, values=part_choices, width=40)
         part_combo.grid(row=0, column=1, padx=5, pady=5)
@@ -1259,15 +1321,16 @@ class CajunMarineApp:
                 return
             
             try:
-                part_id = int(part_var.get().split(' - ')[0])
+                part_id = self.choice_id(part_var.get(), part_ids)
                 quantity = int(qty_entry.get().strip())
                 
-                service.add_ticket_part(ticket_id, part_id, quantity)
-                # Recalculate financial totals
-                try:
-                    service.calculate_ticket_totals(ticket_id)
-                except Exception as calc_err:
-                    print(f"Warning: failed to recalc totals: {calc_err}")
+                # Add the line and recalculate financial totals in one commit
+                with service.transaction():
+                    service.add_ticket_part(ticket_id, part_id, quantity)
+                    try:
+                        service.calculate_ticket_totals(ticket_id)
+                    except Exception as calc_err:
+                        print(f"Warning: failed to recalc totals: {calc_err}")
                 messagebox.showinfo("Success", "Part added to ticket")
                 dialog.destroy()
                 self.show_tickets()
@@ -1288,15 +1351,10 @@ class CajunMarineApp:
         dialog.geometry("400x300")
         
         tk.Label(dialog, text="Mechanic:*").grid(row=0, column=0, sticky='e', padx=5, pady=5)
-        # Get mechanics from database
-        import sqlite3
-        conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-        cur = conn.cursor()
-        cur.execute("SELECT mechanic_id, name, hourly_rate FROM Mechanics ORDER BY name")
-        mechanics = cur.fetchall()
-        conn.close()
-        
-        mechanic_choices = [f"{m[0]} - {m[1]} (${m[2]:.2f}/hr)" for m in mechanics]
+        # Get mechanics (cached by the service until a mechanic changes)
+        mechanic_ids = {f"{m['mechanic_id']} - {m['name']} (${m['hourly_rate']:.2f}/hr)": m['mechanic_id']
+                        for m in service.list_mechanics()}
+        mechanic_choices = list(mechanic_ids)
         mechanic_var = tk.StringVar()
         mechanic_combo = ttk.Combobox(dialog, textvariable=mechanic_var, values=mechanic_choices, width=40)
         mechanic_combo.grid(row=0, column=1, padx=5, pady=5)
@@ -1319,58 +1377,22 @@ class CajunMarineApp:
         desc_text = tk.Text(dialog, width=40, height=5)
         desc_text.grid(row=4, column=1, padx=5, pady=5)
 
+        # The rate only depends on the mechanic for this ticket, so look each one up once
+        rate_texts = {}
+        
         def refresh_rate(*args):
             try:
-                # Determine engine class for ticket
-                conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-                cur = conn.cursor()
-                cur.execute("SELECT engine_id FROM Tickets WHERE ticket_id = ?", (ticket_id,))
-                tr = cur.fetchone()
-                engine_class = None
-                if tr and tr[0]:
-                    cur.execute("SELECT engine_type FROM Engines WHERE engine_id = ?", (tr[0],))
-                    er = cur.fetchone()
-                    eng_type = (er[0].strip().lower() if er and er[0] else '').lower()
-                    if 'outboard' in eng_type:
-                        engine_class = 'outboard'
-                    elif 'inboard' in eng_type:
-                        engine_class = 'inboard'
-                    elif 'stern' in eng_type or 'sterndrive' in eng_type:
-                        engine_class = 'sterndrive'
-                    elif 'pwc' in eng_type or 'jetski' in eng_type:
-                        engine_class = 'pwc'
-                # Load rates
-                cur.execute("SELECT outboard, inboard, sterndrive, pwc FROM LaborRates WHERE id = 1")
-                row = cur.fetchone()
-                if not row:
-                    # initialize defaults if missing
-                    cur.execute("INSERT OR REPLACE INTO LaborRates (id, outboard, inboard, sterndrive, pwc) VALUES (1, 100.0, 120.0, 120.0, 120.0)")
-                    conn.commit()
-                    row = (100.0, 120.0, 120.0, 120.0)
-                rates = {
-                    'outboard': float(row[0]),
-                    'inboard': float(row[1]),
-                    'sterndrive': float(row[2]),
-                    'pwc': float(row[3])
-                }
-                # Fallback to mechanic hourly rate if engine not set
-                display_rate = None
-                if engine_class and engine_class in rates:
-                    display_rate = rates[engine_class]
-                else:
-                    cur.execute("SELECT hourly_rate FROM Mechanics WHERE mechanic_id = ?", (int(mechanic_var.get().split(' - ')[0]) if mechanic_var.get() else -1,))
-                    mr = cur.fetchone()
-                    if mr and mr[0] is not None:
-                        display_rate = float(mr[0])
-                    else:
-                        display_rate = rates['outboard']
-                rate_var.set(f"${display_rate:.2f}")
-                conn.close()
+                mechanic_id = self.choice_id(mechanic_var.get(), mechanic_ids) if mechanic_var.get() else None
+                text = rate_texts.get(mechanic_id)
+                if text is None:
+                    text = rate_texts[mechanic_id] = f"${service.get_customer_labor_rate(ticket_id, mechanic_id):.2f}"
             except Exception:
-                rate_var.set("$0.00")
+                text = "$0.00"
+            if rate_var.get() != text:
+                rate_var.set(text)
 
         # Refresh rate when mechanic selection changes
-        mechanic_var.trace('w', lambda *args: refresh_rate())
+        mechanic_var.trace('w', lambda *args: self.debounce(mechanic_combo, refresh_rate, PICKER_DEBOUNCE_MS))
         refresh_rate()
         
         def save():
@@ -1379,13 +1401,19 @@ class CajunMarineApp:
                 return
             
             try:
-                mechanic_id = int(mechanic_var.get().split(' - ')[0])
+                mechanic_id = self.choice_id(mechanic_var.get(), mechanic_ids)
                 hours = float(hours_entry.get().strip())
                 description = desc_text.get('1.0', 'end').strip() or None
                 # Use override rate if provided
                 rate_override = rate_override_entry.get().strip()
                 labor_rate = float(rate_override) if rate_override else None
-                service.add_ticket_labor(ticket_id, mechanic_id, hours, description, labor_rate)
+                # Add the labor and recalculate financial totals in one commit
+                with service.transaction():
+                    service.add_ticket_labor(ticket_id, mechanic_id, hours, description, labor_rate)
+                    try:
+                        service.calculate_ticket_totals(ticket_id)
+                    except Exception as calc_err:
+                        print(f"Warning: failed to recalc totals: {calc_err}")
                 messagebox.showinfo("Success", "Labor added to ticket")
                 dialog.destroy()
                 self.show_tickets()
@@ -1566,7 +1594,7 @@ class CajunMarineApp:
         search_var = tk.StringVar()
         search_entry = tk.Entry(search_frame, textvariable=search_var, width=40)
         search_entry.pack(side='left')
-        search_var.trace('w', lambda *args: self.filter_parts(tree, search_var.get()))
+        search_var.trace('w', lambda *args: self.debounce(tree, lambda: self.filter_parts(tree, search_var.get())))
         
         # Parts tree
         tree_frame = tk.Frame(self.content_frame)
@@ -1613,41 +1641,41 @@ class CajunMarineApp:
     
     def load_parts(self, tree):
         """Load parts into tree."""
-        tree.delete(*tree.get_children())
-        parts = service.list_parts()
-        for p in parts:
-            tree.insert('', 'end', values=(
-                p['part_id'],
-                p.get('part_number', ''),
-                p['name'],
-                p['stock_quantity'],
-                f"${p['price']:.2f}",
-                p.get('supplier_name', ''),
-                f"${p.get('cost_from_supplier', 0):.2f}" if p.get('cost_from_supplier') else '',
-                f"${p.get('retail_price', 0):.2f}" if p.get('retail_price') else '',
-                'Yes' if p.get('taxable') else 'No'
-            ))
+        # Keep the loaded rows (every Parts column) so editing doesn't re-query
+        tree.records = {}
+        
+        def row(p):
+            tree.records[p['part_id']] = p
+            return self.part_row(p)
+        
+        self.fill_tree_paged(tree, service.list_parts, row)
+    
+    @staticmethod
+    def part_row(p):
+        """Parts tree values for one part."""
+        return (
+            p['part_id'],
+            p.get('part_number', ''),
+            p['name'],
+            p['stock_quantity'],
+            f"${p['price']:.2f}",
+            p.get('supplier_name', ''),
+            f"${p.get('cost_from_supplier', 0):.2f}" if p.get('cost_from_supplier') else '',
+            f"${p.get('retail_price', 0):.2f}" if p.get('retail_price') else '',
+            'Yes' if p.get('taxable') else 'No'
+        )
     
     def filter_parts(self, tree, search_term):
         """Filter parts by search term."""
-        tree.delete(*tree.get_children())
-        parts = service.list_parts()
         search_lower = search_term.lower()
-        for p in parts:
+        parts = [
+            p for p in service.list_parts_iter()
             if (search_lower in p.get('part_number', '').lower() or
                 search_lower in p['name'].lower() or 
-                search_lower in p.get('supplier_name', '').lower()):
-                tree.insert('', 'end', values=(
-                    p['part_id'],
-                    p.get('part_number', ''),
-                    p['name'],
-                    p['stock_quantity'],
-                    f"${p['price']:.2f}",
-                    p.get('supplier_name', ''),
-                    f"${p.get('cost_from_supplier', 0):.2f}" if p.get('cost_from_supplier') else '',
-                    f"${p.get('retail_price', 0):.2f}" if p.get('retail_price') else '',
-                    'Yes' if p.get('taxable') else 'No'
-                ))
+                search_lower in p.get('supplier_name', '').lower())
+        ]
+        tree.records = {p['part_id']: p for p in parts}
+        self.fill_tree(tree, map(self.part_row, parts))
     
     def add_part_dialog(self):
         """Show add part dialog."""
@@ -1715,7 +1743,8 @@ class CajunMarineApp:
             return
         
         part_id = tree.item(selection[0])['values'][0]
-        part = service.get_part(part_id)
+        # The list already loaded the whole row; only go to the database if it's missing
+        part = getattr(tree, 'records', {}).get(int(part_id)) or service.get_part(part_id)
         if not part:
             messagebox.showerror("Error", "Part not found")
             return
@@ -1781,7 +1810,10 @@ class CajunMarineApp:
                 if cost_entry.get().strip():
                     updates['cost_from_supplier'] = float(cost_entry.get().strip())
                 
-                service.update_part(part_id, **updates)
+                # Save the part and refresh totals on tickets that use it in one commit
+                with service.transaction():
+                    service.update_part(part_id, **updates)
+                    service.recalculate_part_tickets(part_id)
                 messagebox.showinfo("Success", "Part updated successfully")
                 dialog.destroy()
                 self.show_parts()
@@ -1879,34 +1911,45 @@ class CajunMarineApp:
     
     def load_new_engines(self, tree, status_filter):
         """Load new engines into tree."""
-        tree.delete(*tree.get_children())
-        
-        if status_filter == "All":
-            engines = service.list_new_engines()
-        else:
-            engines = service.list_new_engines(status_filter)
-        
-        for e in engines:
-            # Get customer name if sold
-            customer_name = ''
-            if e.get('customer_id'):
-                customer = service.get_customer(e['customer_id'])
-                if customer:
-                    customer_name = customer['name']
+        def fetch():
+            # Every column, kept on the tree so the details dialog doesn't re-query
+            if status_filter == "All":
+                engines = service.list_new_engines_full()
+            else:
+                engines = service.list_new_engines_full(status_filter)
             
-            tree.insert('', 'end', values=(
-                e['new_engine_id'],
-                e['hp'],
-                e['model'],
-                e['serial_number'],
-                e['status'],
-                customer_name,
-                e.get('date_installed', ''),
-                'Yes' if e.get('registered_with_tohatsu') else 'No'
-            ), tags=('needs_reg',) if self.engine_needs_registration(e) else ())
+            rows, tags, customers = [], [], {}
+            for e in engines:
+                # Get customer name if sold (once per customer)
+                customer_name = ''
+                customer_id = e.get('customer_id')
+                if customer_id:
+                    if customer_id not in customers:
+                        customers[customer_id] = service.get_customer(customer_id)
+                    e['customer'] = customers[customer_id]
+                    if e['customer']:
+                        customer_name = e['customer']['name']
+                
+                rows.append((
+                    e['new_engine_id'],
+                    e['hp'],
+                    e['model'],
+                    e['serial_number'],
+                    e['status'],
+                    customer_name,
+                    e.get('date_installed', ''),
+                    'Yes' if e.get('registered_with_tohatsu') else 'No'
+                ))
+                tags.append(('needs_reg',) if self.engine_needs_registration(e) else ())
+            return rows, tags, {e['new_engine_id']: e for e in engines}
+        
+        def populate(result):
+            rows, tags, tree.records = result
+            self.fill_tree(tree, rows, tags)
         
         # Highlight engines needing registration
         tree.tag_configure('needs_reg', background='#ffcccc')
+        self.load_in_background(tree, fetch, populate)
     
     def engine_needs_registration(self, engine):
         """Check if engine needs registration."""
@@ -1915,8 +1958,8 @@ class CajunMarineApp:
             engine.get('date_installed') and
             engine.get('registered_with_tohatsu') == 0):
             
-            install_date = datetime.strptime(engine['date_installed'], '%Y-%m-%d')
-            days_since = (datetime.now() - install_date).days
+            install_date = date.fromisoformat(engine['date_installed'])
+            days_since = (date.today() - install_date).days
             return days_since > 30
         return False
     
@@ -1988,7 +2031,12 @@ class CajunMarineApp:
             return
         
         engine_id = tree.item(selection[0])['values'][0]
-        engine = service.get_new_engine(engine_id)
+        # The row loaded for the list has every column and the customer already
+        engine = getattr(tree, 'records', {}).get(int(engine_id))
+        if engine is None:
+            engine = service.get_new_engine(engine_id)
+            if engine and engine.get('customer_id'):
+                engine['customer'] = service.get_customer(engine['customer_id'])
         if not engine:
             messagebox.showerror("Error", "Engine not found")
             return
@@ -2023,14 +2071,13 @@ Notes:
 {engine.get('notes') or 'No notes'}
 """
         
-        if engine.get('customer_id'):
-            customer = service.get_customer(engine['customer_id'])
-            if customer:
-                details += f"\n\nCustomer: {customer['name']}\nPhone: {customer.get('phone', 'N/A')}"
+        customer = engine.get('customer')
+        if customer:
+            details += f"\n\nCustomer: {customer['name']}\nPhone: {customer.get('phone', 'N/A')}"
         
         if self.engine_needs_registration(engine):
-            install_date = datetime.strptime(engine['date_installed'], '%Y-%m-%d')
-            days_overdue = (datetime.now() - install_date).days - 30
+            install_date = date.fromisoformat(engine['date_installed'])
+            days_overdue = (date.today() - install_date).days - 30
             details = f"⚠️  WARNING: Engine needs Tohatsu registration! ({days_overdue} days overdue)\n\n" + details
         
         info_text.insert('1.0', details)
@@ -2051,8 +2098,8 @@ Notes:
         dialog.geometry("400x400")
         
         tk.Label(dialog, text="Customer:*").grid(row=0, column=0, sticky='e', padx=5, pady=5)
-        customers = service.list_customers()
-        customer_choices = [f"{c['customer_id']} - {c['name']}" for c in customers]
+        customer_ids = {label: customer_id for customer_id, label in service.list_customer_choices()}
+        customer_choices = list(customer_ids)
         customer_var = tk.StringVar()
         customer_combo = ttk.Combobox(dialog, textvariable=customer_var, values=customer_choices, width=35)
         customer_combo.grid(row=0, column=1, padx=5, pady=5)
@@ -2063,7 +2110,7 @@ Notes:
         
         tk.Label(dialog, text="Date Sold:").grid(row=2, column=0, sticky='e', padx=5, pady=5)
         date_entry = tk.Entry(dialog, width=35)
-        date_entry.insert(0, datetime.now().strftime('%Y-%m-%d'))
+        date_entry.insert(0, date.today().isoformat())
         date_entry.grid(row=2, column=1, padx=5, pady=5)
         
         tk.Label(dialog, text="Date Installed:").grid(row=3, column=0, sticky='e', padx=5, pady=5)
@@ -2079,7 +2126,7 @@ Notes:
                 return
             
             try:
-                customer_id = int(customer_var.get().split(' - ')[0])
+                customer_id = self.choice_id(customer_var.get(), customer_ids)
                 sale_price = float(price_entry.get().strip())
                 date_sold = date_entry.get().strip() or None
                 date_installed = install_entry.get().strip() or None
@@ -2109,7 +2156,7 @@ Notes:
         engine_id = tree.item(selection[0])['values'][0]
         
         try:
-            registration_date = datetime.now().strftime('%Y-%m-%d')
+            registration_date = date.today().isoformat()
             success = service.update_new_engine(
                 engine_id,
                 registered_with_tohatsu=1,
@@ -2163,7 +2210,7 @@ Notes:
         tk.Label(search_frame, text="Search:", bg='white').pack(side='left', padx=(0, 5))
         search_entry = tk.Entry(search_frame, width=40)
         search_entry.pack(side='left')
-        search_entry.bind('<KeyRelease>', lambda e: self.filter_estimates(tree, search_entry.get()))
+        search_entry.bind('<KeyRelease>', lambda e: self.debounce(tree, lambda: self.filter_estimates(tree, search_entry.get())))
         
         # Estimates tree
         tree_frame = tk.Frame(self.content_frame)
@@ -2216,11 +2263,12 @@ Notes:
     
     def recalculate_all_estimates(self, tree):
         """Recalculate totals for all estimates."""
-        estimates = service.list_estimates()
+        estimates = service.list_estimates(columns=('estimate_id',))
         count = 0
-        for est in estimates:
-            service.calculate_estimate_totals(est['estimate_id'])
-            count += 1
+        with service.transaction():
+            for est in estimates:
+                service.calculate_estimate_totals(est['estimate_id'])
+                count += 1
         
         # Reload the tree
         self.load_estimates(tree)
@@ -2228,46 +2276,37 @@ Notes:
     
     def load_estimates(self, tree):
         """Load estimates into tree."""
-        tree.delete(*tree.get_children())
-        estimates = service.list_estimates()
-        
-        for est in estimates:
-            customer = service.get_customer(est['customer_id'])
-            customer_name = customer['name'] if customer else 'Unknown'
-            
-            tree.insert('', 'end', values=(
-                est['estimate_id'],
-                est['estimate_date'],
-                customer_name,
-                est.get('insurance_info', ''),
-                f"${est.get('subtotal', 0):.2f}",
-                f"${est.get('tax_amount', 0):.2f}",
-                f"${est.get('total', 0):.2f}"
-            ))
+        self.load_in_background(
+            tree,
+            lambda: [self.estimate_row(est) for est in service.list_estimates()],
+            lambda rows: self.fill_tree(tree, rows))
+    
+    @staticmethod
+    def estimate_row(est):
+        """Estimates tree values for one estimate."""
+        return (
+            est['estimate_id'],
+            est['estimate_date'],
+            est.get('customer_name') or 'Unknown',
+            est.get('insurance_info', ''),
+            f"${est.get('subtotal', 0):.2f}",
+            f"${est.get('tax_amount', 0):.2f}",
+            f"${est.get('total', 0):.2f}"
+        )
     
     def filter_estimates(self, tree, search_term):
         """Filter estimates by search term."""
-        tree.delete(*tree.get_children())
-        estimates = service.list_estimates()
+        search_lower = search_term.lower()
         
-        for est in estimates:
-            customer = service.get_customer(est['customer_id'])
-            customer_name = customer['name'] if customer else 'Unknown'
-            insurance_info = est.get('insurance_info', '')
-            
-            if (search_term.lower() in customer_name.lower() or 
-                search_term.lower() in insurance_info.lower() or
-                search_term in str(est['estimate_id'])):
-                
-                tree.insert('', 'end', values=(
-                    est['estimate_id'],
-                    est['estimate_date'],
-                    customer_name,
-                    insurance_info,
-                    f"${est.get('subtotal', 0):.2f}",
-                    f"${est.get('tax_amount', 0):.2f}",
-                    f"${est.get('total', 0):.2f}"
-                ))
+        def fetch():
+            return [
+                self.estimate_row(est) for est in service.list_estimates()
+                if (search_lower in (est.get('customer_name') or 'Unknown').lower() or 
+                    search_lower in est.get('insurance_info', '').lower() or
+                    search_term in str(est['estimate_id']))
+            ]
+        
+        self.load_in_background(tree, fetch, lambda rows: self.fill_tree(tree, rows))
     
     def add_estimate_dialog(self):
         """Create new estimate."""
@@ -2276,8 +2315,8 @@ Notes:
         dialog.geometry("450x550")
         
         tk.Label(dialog, text="Customer:*").grid(row=0, column=0, sticky='e', padx=5, pady=5)
-        customers = service.list_customers()
-        customer_choices = [f"{c['customer_id']} - {c['name']}" for c in customers]
+        customer_ids = {label: customer_id for customer_id, label in service.list_customer_choices()}
+        customer_choices = list(customer_ids)
         customer_var = tk.StringVar()
         customer_combo = ttk.Combobox(dialog, textvariable=customer_var, values=customer_choices, width=35)
         customer_combo.grid(row=0, column=1, padx=5, pady=5)
@@ -2299,7 +2338,7 @@ Notes:
                 return
             
             try:
-                customer_id = int(customer_var.get().split(' - ')[0])
+                customer_id = self.choice_id(customer_var.get(), customer_ids)
                 self.populate_boat_dropdown(customer_id, boat_combo, boat_var)
                 self.populate_engine_dropdown(None, engine_combo, engine_var)
             except Exception:
@@ -2337,7 +2376,7 @@ Notes:
                 return
             
             try:
-                customer_id = int(customer_var.get().split(' - ')[0])
+                customer_id = self.choice_id(customer_var.get(), customer_ids)
                 
                 boat_id = None
                 if boat_var.get():
@@ -2487,9 +2526,10 @@ Notes:
                 unit_price = float(price_entry.get().strip())
                 
                 # Use 'part' as default item_type (could make this selectable)
-                service.add_estimate_line_item(estimate_id, 'part', description, quantity, unit_price)
-                # Recalculate totals
-                service.calculate_estimate_totals(estimate_id)
+                with service.transaction():
+                    service.add_estimate_line_item(estimate_id, 'part', description, quantity, unit_price)
+                    # Recalculate totals
+                    service.calculate_estimate_totals(estimate_id)
                 messagebox.showinfo("Success", "Line item added")
                 dialog.destroy()
                 self.show_estimates()
@@ -2514,7 +2554,7 @@ Notes:
         
         tk.Label(dialog, text="Year:*").grid(row=0, column=0, sticky='e', padx=5, pady=5)
         year_entry = tk.Entry(dialog, width=30)
-        year_entry.insert(0, str(datetime.now().year))
+        year_entry.insert(0, str(date.today().year))
         year_entry.grid(row=0, column=1, padx=5, pady=5)
         
         tk.Label(dialog, text="Make:*").grid(row=1, column=0, sticky='e', padx=5, pady=5)
@@ -2558,29 +2598,16 @@ Notes:
             
             try:
                 # Insert boat into database
-                conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-                cur = conn.cursor()
-                cur.execute("""
-                    INSERT INTO Boats (customer_id, year, make, model, vin, color1, color2, color3)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (customer_id, int(year), make, model, vin_entry.get().strip() or None,
-                      color1_entry.get().strip() or None, color2_entry.get().strip() or None,
-                      color3_entry.get().strip() or None))
-                conn.commit()
-                boat_id = cur.lastrowid
-                conn.close()
+                boat_id = service.create_boat(
+                    customer_id, int(year), make, model, vin_entry.get().strip() or None,
+                    color1_entry.get().strip() or None, color2_entry.get().strip() or None,
+                    color3_entry.get().strip() or None)
                 
                 # Refresh boat dropdown
-                conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-                cur = conn.cursor()
-                cur.execute("SELECT boat_id, year, make, model FROM Boats WHERE customer_id = ?", (customer_id,))
-                boats = [f"{b[0]} - {b[1]} {b[2]} {b[3]}" for b in cur.fetchall()]
-                conn.close()
-                
-                boat_combo['values'] = boats
+                boat_labels = dict(service.list_boat_choices(customer_id))
+                boat_combo['values'] = list(boat_labels.values())
                 # Select the newly added boat
-                new_boat_text = f"{boat_id} - {year} {make} {model}"
-                boat_combo.set(new_boat_text)
+                boat_combo.set(boat_labels.get(boat_id, ''))
                 
                 messagebox.showinfo("Success", f"Boat added successfully!")
                 dialog.destroy()
@@ -2590,19 +2617,12 @@ Notes:
                     vin = vin_entry.get().strip()
                     
                     # Get existing boat info
-                    conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-                    cur = conn.cursor()
-                    cur.execute("""
-                        SELECT b.boat_id, b.year, b.make, b.model, b.customer_id, c.name
-                        FROM Boats b
-                        JOIN Customers c ON b.customer_id = c.customer_id
-                        WHERE b.vin = ?
-                    """, (vin,))
-                    existing = cur.fetchone()
-                    conn.close()
+                    existing = service.get_boat_by_vin(vin)
                     
                     if existing:
-                        boat_id, boat_year, boat_make, boat_model, old_customer_id, old_customer_name = existing
+                        boat_id = existing['boat_id']
+                        boat_year, boat_make, boat_model = existing['year'], existing['make'], existing['model']
+                        old_customer_name = existing['customer_name']
                         
                         transfer = messagebox.askyesno(
                             "Boat Already Exists",
@@ -2616,25 +2636,13 @@ Notes:
                         if transfer:
                             try:
                                 # Transfer ownership
-                                conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-                                cur = conn.cursor()
-                                cur.execute("""
-                                    UPDATE Boats SET customer_id = ? WHERE boat_id = ?
-                                """, (customer_id, boat_id))
-                                conn.commit()
-                                conn.close()
+                                service.transfer_boat(boat_id, customer_id)
                                 
                                 # Refresh boat dropdown
-                                conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-                                cur = conn.cursor()
-                                cur.execute("SELECT boat_id, year, make, model FROM Boats WHERE customer_id = ?", (customer_id,))
-                                boats = [f"{b[0]} - {b[1]} {b[2]} {b[3]}" for b in cur.fetchall()]
-                                conn.close()
-                                
-                                boat_combo['values'] = boats
+                                boat_labels = dict(service.list_boat_choices(customer_id))
+                                boat_combo['values'] = list(boat_labels.values())
                                 # Select the transferred boat
-                                new_boat_text = f"{boat_id} - {boat_year} {boat_make} {boat_model}"
-                                boat_combo.set(new_boat_text)
+                                boat_combo.set(boat_labels.get(boat_id, ''))
                                 
                                 messagebox.showinfo("Success", f"Boat ownership transferred successfully!")
                                 dialog.destroy()
@@ -2721,30 +2729,16 @@ Notes:
             
             try:
                 # Insert engine into database
-                conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-                cur = conn.cursor()
-                cur.execute("""
-                    INSERT INTO Engines (boat_id, engine_type, make, model, hp, serial_number, year, outdrive)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (boat_id, engine_type, make, model, float(hp), 
-                      serial_entry.get().strip() or None,
-                      int(year_entry.get().strip()) if year_entry.get().strip() else None,
-                      outdrive_entry.get().strip() if engine_type == 'Sterndrive' else None))
-                conn.commit()
-                engine_id = cur.lastrowid
-                conn.close()
-                
-                # Refresh engine dropdown
-                conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-                cur = conn.cursor()
-                cur.execute("SELECT engine_id, engine_type, make, model, hp FROM Engines WHERE boat_id = ?", (boat_id,))
-                engines = [f"{e[0]} - {e[2]} {e[3]} ({e[4]} HP {e[1]})" for e in cur.fetchall()]
-                conn.close()
+                engine_id = service.create_engine(
+                    boat_id, engine_type, make, model, float(hp),
+                    serial_entry.get().strip() or None,
+                    int(year_entry.get().strip()) if year_entry.get().strip() else None,
+                    outdrive_entry.get().strip() if engine_type == 'Sterndrive' else None)
                 
-                engine_combo['values'] = engines
-                # Select the newly added engine
-                new_engine_text = f"{engine_id} - {make} {model} ({hp} HP {engine_type})"
-                engine_combo.set(new_engine_text)
+                # Refresh engine dropdown and select the newly added engine
+                engine_labels = dict(service.list_engine_choices(boat_id))
+                engine_combo['values'] = list(engine_labels.values())
+                engine_combo.set(engine_labels.get(engine_id, ''))
                 
                 messagebox.showinfo("Success", f"Engine added successfully!")
                 dialog.destroy()
@@ -2818,15 +2812,13 @@ Notes:
                 )
 
                 # Refresh customer dropdown values
-                customers = service.list_customers()
-                customer_choices = [f"{c['customer_id']} - {c['name']}" for c in customers]
-                customer_combo['values'] = customer_choices
+                customer_labels = dict(service.list_customer_choices())
+                customer_combo['values'] = list(customer_labels.values())
                 # Select the newly added customer
-                for choice in customer_choices:
-                    if choice.startswith(f"{new_id} - "):
-                        customer_combo.set(choice)
-                        customer_var.set(choice)
-                        break
+                label = customer_labels.get(new_id)
+                if label is not None:
+                    customer_combo.set(label)
+                    customer_var.set(label)
 
                 messagebox.showinfo("Success", "Customer added successfully")
                 dialog.destroy()
@@ -2842,8 +2834,8 @@ Notes:
         dialog.geometry("450x250")
         
         tk.Label(dialog, text="Part:*").grid(row=0, column=0, sticky='e', padx=5, pady=5)
-        parts = service.list_parts()
-        part_choices = [f"{p['part_id']} - {p['name']} (${p['price']:.2f})" for p in parts]
+        part_ids = {label: part_id for part_id, label in service.list_part_choices()}
+        part_choices = list(part_ids)
         part_var = tk.StringVar()
         
         part_frame = tk.Frame(dialog)
@@ -2868,15 +2860,16 @@ Notes:
                 return
             
             try:
-                part_id = int(part_var.get().split(' - ')[0])
+                part_id = self.choice_id(part_var.get(), part_ids)
                 quantity = int(qty_entry.get().strip())
                 price_override = float(price_entry.get().strip()) if price_entry.get().strip() else None
                 
-                service.add_ticket_part(ticket_id, part_id, quantity, price_override)
-                try:
-                    service.calculate_ticket_totals(ticket_id)
-                except Exception as calc_err:
-                    print(f"Warning: failed to recalc totals: {calc_err}")
+                with service.transaction():
+                    service.add_ticket_part(ticket_id, part_id, quantity, price_override)
+                    try:
+                        service.calculate_ticket_totals(ticket_id)
+                    except Exception as calc_err:
+                        print(f"Warning: failed to recalc totals: {calc_err}")
                 messagebox.showinfo("Success", "Part added to ticket")
                 dialog.destroy()
                 parent_dialog.destroy()
@@ -2896,15 +2889,10 @@ Notes:
         
         tk.Label(dialog, text="Mechanic:*").grid(row=0, column=0, sticky='e', padx=5, pady=5)
         
-        # Get mechanics from database
-        import sqlite3
-        conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-        cur = conn.cursor()
-        cur.execute("SELECT mechanic_id, name, hourly_rate FROM Mechanics ORDER BY name")
-        mechanics = cur.fetchall()
-        conn.close()
-        
-        mechanic_choices = [f"{m[0]} - {m[1]} (${m[2]:.2f}/hr)" for m in mechanics]
+        # Get mechanics (cached by the service until a mechanic changes)
+        mechanic_ids = {f"{m['mechanic_id']} - {m['name']} (${m['hourly_rate']:.2f}/hr)": m['mechanic_id']
+                        for m in service.list_mechanics()}
+        mechanic_choices = list(mechanic_ids)
         mechanic_var = tk.StringVar()
         mechanic_combo = ttk.Combobox(dialog, textvariable=mechanic_var, values=mechanic_choices, width=40)
         mechanic_combo.grid(row=0, column=1, padx=5, pady=5)
@@ -2928,16 +2916,17 @@ Notes:
                 return
             
             try:
-                mechanic_id = int(mechanic_var.get().split(' - ')[0])
+                mechanic_id = self.choice_id(mechanic_var.get(), mechanic_ids)
                 hours = float(hours_entry.get().strip())
                 rate_override = float(rate_entry.get().strip()) if rate_entry.get().strip() else None
                 description = desc_text.get('1.0', 'end').strip()
                 
-                service.add_ticket_labor(ticket_id, mechanic_id, hours, description or "", rate_override)
-                try:
-                    service.calculate_ticket_totals(ticket_id)
-                except Exception as calc_err:
-                    print(f"Warning: failed to recalc totals: {calc_err}")
+                with service.transaction():
+                    service.add_ticket_labor(ticket_id, mechanic_id, hours, description or "", rate_override)
+                    try:
+                        service.calculate_ticket_totals(ticket_id)
+                    except Exception as calc_err:
+                        print(f"Warning: failed to recalc totals: {calc_err}")
                 messagebox.showinfo("Success", "Labor added to ticket")
                 dialog.destroy()
                 parent_dialog.destroy()
@@ -3021,8 +3010,8 @@ Notes:
         
         # Load backups
         backups = service.list_backups()
-        for filename, date, size in backups:
-            backup_tree.insert('', 'end', values=(filename, date, f"{size:.2f}"))
+        for filename, created, size in backups:
+            backup_tree.insert('', 'end', values=(filename, created, f"{size:.2f}"))
         
         tk.Button(dialog, text="Close", command=dialog.destroy).pack(pady=10)
     
@@ -3058,8 +3047,8 @@ Notes:
         backup_list = tk.Listbox(dialog, width=70, height=10)
         backup_list.pack(padx=20, pady=10)
         
-        for filename, date, size in backups:
-            backup_list.insert('end', f"{filename} - {date} ({size:.2f} MB)")
+        for filename, created, size in backups:
+            backup_list.insert('end', f"{filename} - {created} ({size:.2f} MB)")
         
         def do_restore():
             selection = backup_list.curselection()
@@ -3076,6 +3065,9 @@ Notes:
             )
             
             if confirm:
+                # Let background loads finish and their worker threads (and connections) go first
+                self.db_pool.shutdown(wait=True)
+                self.db_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='db')
                 success, error = service.restore_backup(filename)
                 if success:
                     messagebox.showinfo("Success", "Database restored successfully!\n\nPlease restart the application.")
@@ -3217,10 +3209,9 @@ Notes:
                 part_id = service.create_part(part_number, name, int(stock), float(price), supplier, cost, float(price), taxable_var.get())
                 
                 # Refresh part dropdown
-                parts = service.list_parts()
-                part_choices = [f"{p['part_id']} - {p['name']} (${p['price']:.2f})" for p in parts]
-                part_combo['values'] = part_choices
-                part_var.set(f"{part_id} - {name} (${price})")
+                part_choices = dict(service.list_part_choices())
+                part_combo['values'] = list(part_choices.values())
+                part_var.set(part_choices.get(part_id, f"{part_id} - {name}"))
                 
                 messagebox.showinfo("Success", "Part added successfully!")
                 dialog.destroy()
@@ -3288,20 +3279,13 @@ Notes:
         mech_tree.pack(fill='both', expand=True, padx=10, pady=10)
         
         # Load mechanics
-        import sqlite3
-        conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-        cur = conn.cursor()
-        cur.execute("SELECT mechanic_id, name, hourly_rate, phone, email FROM Mechanics ORDER BY name")
-        mechanics = cur.fetchall()
-        conn.close()
-        
-        for mech in mechanics:
+        for mech in service.list_mechanics():
             mech_tree.insert('', 'end', values=(
-                mech[0],
-                mech[1],
-                f"${mech[2]:.2f}",
-                mech[3] or 'N/A',
-                mech[4] or 'N/A'
+                mech['mechanic_id'],
+                mech['name'],
+                f"${mech['hourly_rate']:.2f}",
+                mech['phone'] or 'N/A',
+                mech['email'] or 'N/A'
             ))
         
         # Buttons
@@ -3339,31 +3323,11 @@ Notes:
 
         # Load existing or defaults
         try:
-            import sqlite3
-            conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-            cur = conn.cursor()
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS LaborRates (
-                    id INTEGER PRIMARY KEY CHECK (id = 1),
-                    outboard REAL NOT NULL,
-                    inboard REAL NOT NULL,
-                    sterndrive REAL NOT NULL,
-                    pwc REAL NOT NULL
-                )
-            """)
-            conn.commit()
-            cur.execute("SELECT outboard, inboard, sterndrive, pwc FROM LaborRates WHERE id = 1")
-            row = cur.fetchone()
-            if not row:
-                # Defaults: Outboard 100, Inboard 120, Sterndrive 120, PWC 120
-                cur.execute("INSERT INTO LaborRates (id, outboard, inboard, sterndrive, pwc) VALUES (1, 100.0, 120.0, 120.0, 120.0)")
-                conn.commit()
-                row = (100.0, 120.0, 120.0, 120.0)
-            conn.close()
-            out_entry.insert(0, str(row[0]))
-            inb_entry.insert(0, str(row[1]))
-            ster_entry.insert(0, str(row[2]))
-            pwc_entry.insert(0, str(row[3]))
+            rates = service.get_labor_rates()
+            out_entry.insert(0, str(rates['outboard']))
+            inb_entry.insert(0, str(rates['inboard']))
+            ster_entry.insert(0, str(rates['sterndrive']))
+            pwc_entry.insert(0, str(rates['pwc']))
         except Exception as e:
             tk.Label(rates_frame, text=f"Error loading rates: {e}", fg='red').pack(anchor='w', padx=10)
 
@@ -3373,12 +3337,7 @@ Notes:
                 inb = float(inb_entry.get().strip())
                 ster = float(ster_entry.get().strip())
                 pwc = float(pwc_entry.get().strip())
-                import sqlite3
-                conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-                cur = conn.cursor()
-                cur.execute("UPDATE LaborRates SET outboard = ?, inboard = ?, sterndrive = ?, pwc = ? WHERE id = 1", (out, inb, ster, pwc))
-                conn.commit()
-                conn.close()
+                service.set_labor_rates(out, inb, ster, pwc)
                 messagebox.showinfo("Success", "Labor rates saved")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save rates: {e}")
@@ -3407,21 +3366,9 @@ Notes:
 
         tk.Label(scrollable_frame, text="Financial Summary", font=('Segoe UI', 16, 'bold'), bg='white').pack(anchor='w', padx=10, pady=(10, 5))
 
-        # Get financial data
-        import sqlite3
-        from datetime import datetime, timedelta
-        conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-        cur = conn.cursor()
-
-        # Monthly tax collected
-        today = datetime.now()
-        first_of_month = today.replace(day=1).strftime('%Y-%m-%d')
-        cur.execute("""
-            SELECT COALESCE(SUM(tax_amount), 0) as total_tax
-            FROM Tickets
-            WHERE date_opened >= ? AND status = 'Closed'
-        """, (first_of_month,))
-        monthly_tax = cur.fetchone()[0]
+        # Get financial data (one snapshot on the service's connection)
+        summary = service.get_financial_summary()
+        monthly_tax = summary['monthly_tax']
 
         # Tax section
         tax_frame = tk.LabelFrame(scrollable_frame, text="Tax Collection (Current Month)", font=('Segoe UI', 11, 'bold'), bg='white', padx=10, pady=10)
@@ -3432,48 +3379,10 @@ Notes:
         mech_frame = tk.LabelFrame(scrollable_frame, text="Mechanic Earnings", font=('Segoe UI', 11, 'bold'), bg='white', padx=10, pady=10)
         mech_frame.pack(fill='x', padx=10, pady=10)
 
-        # Get all mechanics
-        cur.execute("SELECT mechanic_id, name, hourly_rate FROM Mechanics ORDER BY name")
-        mechanics_list = cur.fetchall()
-
-        # Week range
-        week_start = (today - timedelta(days=today.weekday())).strftime('%Y-%m-%d')
-        
-        for mech in mechanics_list:
-            mech_id, mech_name, mech_rate = mech
-            
-            # This week earnings
-            cur.execute("""
-                SELECT COALESCE(SUM(ta.hours_worked * ta.labor_rate), 0) as week_total
-                FROM TicketAssignments ta
-                JOIN Tickets t ON ta.ticket_id = t.ticket_id
-                WHERE ta.mechanic_id = ? AND t.date_opened >= ?
-            """, (mech_id, week_start))
-            week_earnings = cur.fetchone()[0]
-
-            # Total historical earnings
-            cur.execute("""
-                SELECT COALESCE(SUM(ta.hours_worked * ta.labor_rate), 0) as total_earnings
-                FROM TicketAssignments ta
-                WHERE ta.mechanic_id = ?
-            """, (mech_id,))
-            total_earnings = cur.fetchone()[0]
-
-            # Mechanic pay (using their hourly rate)
-            cur.execute("""
-                SELECT COALESCE(SUM(ta.hours_worked * ?), 0) as week_pay
-                FROM TicketAssignments ta
-                JOIN Tickets t ON ta.ticket_id = t.ticket_id
-                WHERE ta.mechanic_id = ? AND t.date_opened >= ?
-            """, (mech_rate, mech_id, week_start))
-            week_pay = cur.fetchone()[0]
-
-            cur.execute("""
-                SELECT COALESCE(SUM(ta.hours_worked * ?), 0) as total_pay
-                FROM TicketAssignments ta
-                WHERE ta.mechanic_id = ?
-            """, (mech_rate, mech_id))
-            total_pay = cur.fetchone()[0]
+        for mech in summary['mechanics']:
+            mech_name = mech['name']
+            week_earnings, week_pay = mech['week_billed'], mech['week_paid']
+            total_earnings, total_pay = mech['total_billed'], mech['total_paid']
 
             mech_detail = tk.Frame(mech_frame, bg='white')
             mech_detail.pack(fill='x', pady=5)
@@ -3488,17 +3397,7 @@ Notes:
         parts_frame = tk.LabelFrame(scrollable_frame, text="Parts Profit", font=('Segoe UI', 11, 'bold'), bg='white', padx=10, pady=10)
         parts_frame.pack(fill='x', padx=10, pady=10)
 
-        # Calculate parts profit
-        cur.execute("""
-            SELECT 
-                COALESCE(SUM(tp.quantity_used * p.price), 0) as parts_revenue,
-                COALESCE(SUM(tp.quantity_used * COALESCE(p.cost_from_supplier, 0)), 0) as parts_cost
-            FROM TicketParts tp
-            JOIN Parts p ON tp.part_id = p.part_id
-            JOIN Tickets t ON tp.ticket_id = t.ticket_id
-            WHERE t.status = 'Closed'
-        """)
-        parts_revenue, parts_cost = cur.fetchone()
+        parts_revenue, parts_cost = summary['parts_revenue'], summary['parts_cost']
         parts_profit = parts_revenue - parts_cost
 
         tk.Label(parts_frame, text=f"Total Parts Revenue: ${parts_revenue:.2f}", font=('Segoe UI', 10), bg='white').pack(anchor='w')
@@ -3510,18 +3409,7 @@ Notes:
         summary_frame.pack(fill='x', padx=10, pady=10)
 
         # Total labor billed vs mechanic pay
-        cur.execute("""
-            SELECT COALESCE(SUM(ta.hours_worked * ta.labor_rate), 0) as total_billed
-            FROM TicketAssignments ta
-        """)
-        total_labor_billed = cur.fetchone()[0]
-
-        cur.execute("""
-            SELECT COALESCE(SUM(ta.hours_worked * m.hourly_rate), 0) as total_paid
-            FROM TicketAssignments ta
-            JOIN Mechanics m ON ta.mechanic_id = m.mechanic_id
-        """)
-        total_labor_paid = cur.fetchone()[0]
+        total_labor_billed, total_labor_paid = summary['labor_billed'], summary['labor_paid']
 
         labor_profit = total_labor_billed - total_labor_paid
 
@@ -3534,8 +3422,6 @@ Notes:
         tk.Label(summary_frame, text=f"Parts Profit: ${parts_profit:.2f}", font=('Segoe UI', 10, 'bold'), bg='white').pack(anchor='w')
         tk.Label(summary_frame, text=f"Total Shop Profit (Labor + Parts): ${labor_profit + parts_profit:.2f}", 
                 font=('Segoe UI', 12, 'bold'), bg='white', fg='#2d6a9f').pack(anchor='w', pady=(5, 0))
-
-        conn.close()
     
     def add_mechanic_dialog(self):
         """Add new mechanic."""
@@ -3568,15 +3454,8 @@ Notes:
                 return
             
             try:
-                import sqlite3
-                conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-                cur = conn.cursor()
-                cur.execute("""
-                    INSERT INTO Mechanics (name, hourly_rate, phone, email)
-                    VALUES (?, ?, ?, ?)
-                """, (name, float(rate), phone_entry.get().strip() or None, email_entry.get().strip() or None))
-                conn.commit()
-                conn.close()
+                service.create_mechanic(name, float(rate), phone_entry.get().strip() or None,
+                                        email_entry.get().strip() or None)
                 
                 messagebox.showinfo("Success", "Mechanic added successfully!")
                 dialog.destroy()
@@ -3596,12 +3475,7 @@ Notes:
         mechanic_id = tree.item(selection[0])['values'][0]
         
         # Get current mechanic data
-        import sqlite3
-        conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-        cur = conn.cursor()
-        cur.execute("SELECT name, hourly_rate, phone, email FROM Mechanics WHERE mechanic_id = ?", (mechanic_id,))
-        mech = cur.fetchone()
-        conn.close()
+        mech = service.get_mechanic(mechanic_id)
         
         if not mech:
             messagebox.showerror("Error", "Mechanic not found")
@@ -3614,22 +3488,22 @@ Notes:
         tk.Label(dialog, text="Name:*").grid(row=0, column=0, sticky='e', padx=5, pady=5)
         name_entry = tk.Entry(dialog, width=35)
         name_entry.grid(row=0, column=1, padx=5, pady=5)
-        name_entry.insert(0, mech[0])
+        name_entry.insert(0, mech['name'])
         
         tk.Label(dialog, text="Hourly Rate:*").grid(row=1, column=0, sticky='e', padx=5, pady=5)
         rate_entry = tk.Entry(dialog, width=35)
         rate_entry.grid(row=1, column=1, padx=5, pady=5)
-        rate_entry.insert(0, str(mech[1]))
+        rate_entry.insert(0, str(mech['hourly_rate']))
         
         tk.Label(dialog, text="Phone:").grid(row=2, column=0, sticky='e', padx=5, pady=5)
         phone_entry = tk.Entry(dialog, width=35)
         phone_entry.grid(row=2, column=1, padx=5, pady=5)
-        phone_entry.insert(0, mech[2] or '')
+        phone_entry.insert(0, mech['phone'] or '')
         
         tk.Label(dialog, text="Email:").grid(row=3, column=0, sticky='e', padx=5, pady=5)
         email_entry = tk.Entry(dialog, width=35)
         email_entry.grid(row=3, column=1, padx=5, pady=5)
-        email_entry.insert(0, mech[3] or '')
+        email_entry.insert(0, mech['email'] or '')
         
         def save():
             name = name_entry.get().strip()
@@ -3640,16 +3514,10 @@ Notes:
                 return
             
             try:
-                conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-                cur = conn.cursor()
-                cur.execute("""
-                    UPDATE Mechanics 
-                    SET name = ?, hourly_rate = ?, phone = ?, email = ?
-                    WHERE mechanic_id = ?
-                """, (name, float(rate), phone_entry.get().strip() or None, 
-                     email_entry.get().strip() or None, mechanic_id))
-                conn.commit()
-                conn.close()
+                service.update_mechanic(
+                    mechanic_id, name=name, hourly_rate=float(rate),
+                    phone=phone_entry.get().strip() or None,
+                    email=email_entry.get().strip() or None)
                 
                 messagebox.showinfo("Success", "Mechanic updated successfully!")
                 dialog.destroy()
@@ -3673,12 +3541,7 @@ Notes:
             return
         
         try:
-            import sqlite3
-            conn = sqlite3.connect(service.get_db_path(), timeout=10.0)
-            cur = conn.cursor()
-            cur.execute("DELETE FROM Mechanics WHERE mechanic_id = ?", (mechanic_id,))
-            conn.commit()
-            conn.close()
+            service.delete_mechanic(mechanic_id)
             
             messagebox.showinfo("Success", "Mechanic deleted successfully!")
             self.show_settings()
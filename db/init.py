@@ -18,25 +18,53 @@ def _column_exists(cur, table: str, column: str) -> bool:
     cur.execute(f"PRAGMA table_info({table})")
     return any(row[1] == column for row in cur.fetchall())
 
-def initialize_database():
-    """Create tables if missing and apply idempotent migrations."""
-    db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
+# Stored in PRAGMA user_version once the column migrations below have run;
+# bump it when adding a migration so existing databases pick it up
+SCHEMA_VERSION = 1
 
-    # Create schema tables if not present
-    schema_path = get_schema_path()
-    if os.path.exists(schema_path):
-        with open(schema_path, 'r') as f:
-            schema_sql = f.read()
-        # Use executescript; SQLite will ignore CREATE TABLE IF NOT EXISTS if authored so.
-        try:
-            cur.executescript(schema_sql)
-        except sqlite3.Error:
-            # If schema has plain CREATE TABLE, skip errors for existing tables.
-            pass
+# (index name, table, columns) - created after migrations so migrated columns exist
+_INDEXES = [
+    # get_engines_needing_registration: equality filters first, then the date range
+    ('idx_newengines_registration', 'NewEngines',
+     'status, paid_in_full, registered_with_tohatsu, date_installed'),
+    ('idx_newengines_customer', 'NewEngines', 'customer_id'),
+    # Ticket child rows are always looked up by ticket
+    ('idx_ticketparts_ticket', 'TicketParts', 'ticket_id'),
+    ('idx_ticketassignments_ticket', 'TicketAssignments', 'ticket_id'),
+    # Mechanic earnings: per-mechanic labor sums answered from the index alone
+    ('idx_ticketassignments_mechanic', 'TicketAssignments',
+     'mechanic_id, ticket_id, hours_worked, labor_rate'),
+    # get_ticket_deposits orders by payment_date within a ticket
+    ('idx_deposits_ticket', 'Deposits', 'ticket_id, payment_date'),
+    # The tickets list, with or without a status filter, pages through
+    # ORDER BY date_opened DESC, ticket_id DESC without a sort step
+    ('idx_tickets_status_opened', 'Tickets', 'status, date_opened DESC, ticket_id DESC'),
+    ('idx_tickets_opened', 'Tickets', 'date_opened DESC, ticket_id DESC'),
+    # The parts list pages through ORDER BY name, part_id
+    ('idx_parts_name', 'Parts', 'name, part_id'),
+    # Customer lists and pickers are ORDER BY name COLLATE NOCASE
+    ('idx_customers_name', 'Customers', 'name COLLATE NOCASE'),
+    # get_customer_boats: a customer's boats, newest first
+    ('idx_boats_customer', 'Boats', 'customer_id, year DESC'),
+    ('idx_engines_boat', 'Engines', 'boat_id'),
+]
+
+def _index_exists(cur, name: str) -> bool:
+    cur.execute("SELECT name FROM sqlite_master WHERE type='index' AND name=?", (name,))
+    return cur.fetchone() is not None
 
-    # Migrations: add columns safely
+def ensure_indexes(cur) -> None:
+    """Create any missing indexes; refresh planner statistics when one was added."""
+    created = False
+    for name, table, columns in _INDEXES:
+        if _table_exists(cur, table) and not _index_exists(cur, name):
+            cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+            created = True
+    if created:
+        cur.execute("ANALYZE")
+
+def _migrate_columns(cur) -> None:
+    """Add columns introduced after the original schema (idempotent)."""
     # Engines
     if _table_exists(cur, 'Engines'):
         if not _column_exists(cur, 'Engines', 'engine_type'):
@@ -65,6 +93,30 @@ def initialize_database():
         if not _column_exists(cur, 'Tickets', 'customer_notes'):
             cur.execute("ALTER TABLE Tickets ADD COLUMN customer_notes TEXT")
 
+def initialize_database():
+    """Create tables if missing and apply idempotent migrations."""
+    db_path = get_db_path()
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+
+    # Create schema tables if not present
+    schema_path = get_schema_path()
+    if os.path.exists(schema_path):
+        with open(schema_path, 'r') as f:
+            schema_sql = f.read()
+        # Use executescript; SQLite will ignore CREATE TABLE IF NOT EXISTS if authored so.
+        try:
+            cur.executescript(schema_sql)
+        except sqlite3.Error:
+            # If schema has plain CREATE TABLE, skip errors for existing tables.
+            pass
+
+    # Migrations: add columns safely (skipped once user_version is current)
+    cur.execute("PRAGMA user_version")
+    if cur.fetchone()[0] < SCHEMA_VERSION:
+        _migrate_columns(cur)
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
     # LaborRates single-row table
     cur.execute("""
         CREATE TABLE IF NOT EXISTS LaborRates (
@@ -83,6 +135,8 @@ def initialize_database():
             (100.0, 120.0, 120.0, 120.0)
         )
 
+    ensure_indexes(cur)
+
     conn.commit()
     conn.close()
 
@@ -5,22 +5,35 @@ Includes validation, backup utilities, and database helpers.
 """
 import sqlite3
 import os
+import atexit
+import threading
 import shutil
 import re
+import json
+import time
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Tuple, Any
+from datetime import date, datetime, timedelta
+from typing import Optional, Dict, List, Tuple, Any, Iterator, Sequence
 import argparse
+from contextlib import contextmanager
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+
+from db.init import ensure_indexes
 
 
 # ============================================================================
 # DATABASE PATH & UTILITIES
 # ============================================================================
 
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DB_PATH = os.path.join(_ROOT_DIR, "Cajun_Data.db")
+_SCHEMA_PATH = os.path.join(_ROOT_DIR, "schema.sql")
+
+
 def get_db_path():
     """Return the absolute path to the database file."""
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    return os.path.join(os.path.dirname(base_dir), "Cajun_Data.db")
+    return _DB_PATH
 
 def _format_phone(raw_phone: str) -> str:
     """Format phone as (###)###-#### if it has 10 digits; otherwise return original stripped."""
@@ -35,31 +48,37 @@ def ensure_database_exists():
     """Ensure database exists by creating from schema if needed."""
     db_path = get_db_path()
     if not os.path.exists(db_path):
-        schema_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'schema.sql')
+        schema_path = _SCHEMA_PATH
         if os.path.exists(schema_path):
-            with open(schema_path, 'r') as f:
-                schema_sql = f.read()
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            cursor.executescript(schema_sql)
-            conn.commit()
-            conn.close()
+            schema_sql = Path(schema_path).read_text()
+            # Autocommit: executescript manages its own transaction for the DDL
+            conn = sqlite3.connect(db_path, isolation_level=None)
+            try:
+                conn.executescript(schema_sql)
+                ensure_indexes(conn.cursor())
+            finally:
+                conn.close()
 
 
 # ============================================================================
 # VALIDATION FUNCTIONS
 # ============================================================================
 
+_NON_DIGIT_RE = re.compile(r'\D')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_SERIAL_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+
 def validate_phone(phone):
     """
     Validate phone number format.
     Returns (is_valid, formatted_phone, error_message)
     """
-    if not phone or phone.strip() == '':
+    if not phone or phone.isspace():
         return True, '', None  # Empty is OK
     
     # Remove all non-digit characters
-    digits = re.sub(r'\D', '', phone)
+    digits = _NON_DIGIT_RE.sub('', phone)
     
     # Check if we have exactly 10 digits
     if len(digits) != 10:
@@ -75,13 +94,12 @@ def validate_email(email):
     Validate email format.
     Returns (is_valid, error_message)
     """
-    if not email or email.strip() == '':
+    email = email.strip() if email else ''
+    if not email:
         return True, None  # Empty is OK
     
     # Basic email regex pattern
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    if re.match(pattern, email.strip()):
+    if _EMAIL_RE.match(email):
         return True, None
     else:
         return False, "Invalid email format (e.g., user@example.com)"
@@ -92,13 +110,12 @@ def validate_serial_number(serial):
     Validate serial number (alphanumeric, no special chars except dash/underscore).
     Returns (is_valid, error_message)
     """
-    if not serial or serial.strip() == '':
+    serial = serial.strip() if serial else ''
+    if not serial:
         return False, "Serial number is required"
     
     # Allow alphanumeric, dash, and underscore only
-    pattern = r'^[a-zA-Z0-9_-]+$'
-    
-    if re.match(pattern, serial.strip()):
+    if _SERIAL_RE.match(serial):
         return True, None
     else:
         return False, "Serial number can only contain letters, numbers, dashes, and underscores"
@@ -152,6 +169,10 @@ def validate_integer(value, field_name, min_value=None, max_value=None):
 # BACKUP UTILITIES
 # ============================================================================
 
+# VACUUM INTO is available from SQLite 3.27
+_HAS_VACUUM_INTO = sqlite3.sqlite_version_info >= (3, 27, 0)
+
+
 def get_backup_dir():
     """Get the backup directory path, create if doesn't exist."""
     backup_dir = Path("c:/Cajun Program/backups")
@@ -159,14 +180,39 @@ def get_backup_dir():
     return backup_dir
 
 
+_db_file_seen = False
+
+
+def _db_file_exists() -> bool:
+    """Check that the database file exists; once seen it is assumed to stay."""
+    global _db_file_seen
+    if not _db_file_seen:
+        _db_file_seen = os.path.exists(get_db_path())
+    return _db_file_seen
+
+
+def _backup_timestamp(filename: str) -> Optional[str]:
+    """Return the YYYYMMDD_HHMMSS stamp from a backup filename, or None if it has none."""
+    stamp = filename[len("Cajun_Data_backup_"):-len(".db")]
+    if len(stamp) == 15 and stamp[8] == '_' and stamp[:8].isdigit() and stamp[9:].isdigit():
+        return stamp
+    return None
+
+
+def _scan_backups(backup_dir) -> List[os.DirEntry]:
+    """List backup files in backup_dir as DirEntry objects (stat results are cached on them)."""
+    with os.scandir(backup_dir) as it:
+        return [e for e in it
+                if e.name.startswith("Cajun_Data_backup_") and e.name.endswith(".db") and e.is_file()]
+
+
 def create_backup():
     """
     Create a timestamped backup of the database.
     Returns (success, backup_path, error_message)
     """
     try:
-        db_path = get_db_path()
-        if not os.path.exists(db_path):
+        if not _db_file_exists():
             return False, None, "Database file not found"
         
         backup_dir = get_backup_dir()
@@ -174,8 +220,18 @@ def create_backup():
         backup_filename = f"Cajun_Data_backup_{timestamp}.db"
         backup_path = backup_dir / backup_filename
         
-        # Copy the database file
-        shutil.copy2(db_path, backup_path)
+        # Copy through SQLite so changes still in the WAL file are included
+        if backup_path.exists():
+            backup_path.unlink()
+        if _HAS_VACUUM_INTO:
+            # Writes only live pages, so the backup comes out compacted
+            _get_connection().execute("VACUUM INTO ?", (str(backup_path),))
+        else:
+            dest = sqlite3.connect(str(backup_path))
+            try:
+                _get_connection().backup(dest)
+            finally:
+                dest.close()
         
         # Clean up old backups (keep last 7 days)
         cleanup_old_backups()
@@ -189,11 +245,17 @@ def cleanup_old_backups(keep_days=7):
     """Remove backup files older than keep_days."""
     try:
         backup_dir = get_backup_dir()
-        cutoff_time = datetime.now().timestamp() - (keep_days * 24 * 60 * 60)
+        cutoff = datetime.now() - timedelta(days=keep_days)
+        cutoff_time = cutoff.timestamp()
+        cutoff_stamp = cutoff.strftime('%Y%m%d_%H%M%S')
         
-        for backup_file in backup_dir.glob("Cajun_Data_backup_*.db"):
-            if backup_file.stat().st_mtime < cutoff_time:
-                backup_file.unlink()
+        for entry in _scan_backups(backup_dir):
+            # Names embed their creation time; anything stamped inside the window is kept without a stat
+            stamp = _backup_timestamp(entry.name)
+            if stamp and stamp >= cutoff_stamp:
+                continue
+            if entry.stat().st_mtime < cutoff_time:
+                os.remove(entry.path)
     except Exception:
         pass  # Silently fail on cleanup
 
@@ -206,11 +268,15 @@ def list_backups():
     backups = []
     backup_dir = get_backup_dir()
     
-    for backup_file in sorted(backup_dir.glob("Cajun_Data_backup_*.db"), reverse=True):
-        stat = backup_file.stat()
-        date_created = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
+    for entry in sorted(_scan_backups(backup_dir), key=lambda e: e.name, reverse=True):
+        stat = entry.stat()
+        stamp = _backup_timestamp(entry.name)
+        if stamp:
+            date_created = f"{stamp[0:4]}-{stamp[4:6]}-{stamp[6:8]} {stamp[9:11]}:{stamp[11:13]}:{stamp[13:15]}"
+        else:
+            date_created = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
         size_mb = stat.st_size / (1024 * 1024)
-        backups.append((backup_file.name, date_created, size_mb))
+        backups.append((entry.name, date_created, size_mb))
     
     return backups
 
@@ -219,22 +285,47 @@ def restore_backup(backup_filename):
     """
     Restore database from a backup file.
     Returns (success, error_message)
+    
+    Other threads must be finished with the database first; their connections
+    are only closed (and reopened) by those threads.
     """
     try:
         backup_dir = get_backup_dir()
         backup_path = backup_dir / backup_filename
+        db_path = get_db_path()
         
-        if not backup_path.exists():
+        # Stage the backup beside the database first; a missing backup fails here
+        # before anything about the live database has been touched
+        staging_path = db_path + ".restoring"
+        try:
+            shutil.copyfile(backup_path, staging_path)
+        except FileNotFoundError:
             return False, "Backup file not found"
         
+        # Drop this thread's connection; other threads reconnect on their next call
+        close_connections()
+        
         # Create a backup of the current database before restoring
-        db_path = get_db_path()
-        if os.path.exists(db_path):
+        if _db_file_exists():
+            # Fold the WAL into the main file so it can be copied on its own
+            conn = sqlite3.connect(db_path)
+            try:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                conn.close()
             temp_backup = db_path + ".pre_restore_backup"
-            shutil.copy2(db_path, temp_backup)
+            if os.path.exists(temp_backup):
+                os.remove(temp_backup)
+            try:
+                # Hardlink instead of copying; the swap below gives db_path a new file
+                os.link(db_path, temp_backup)
+            except OSError:
+                shutil.copy2(db_path, temp_backup)
         
-        # Restore the backup
-        shutil.copy2(backup_path, db_path)
+        # Swap the staged backup in atomically
+        os.replace(staging_path, db_path)
+        invalidate_labor_rates_cache()
+        invalidate_mechanics_cache()
         
         return True, None
     except Exception as e:
@@ -257,30 +348,257 @@ def auto_backup_on_startup():
 # CONSTANTS
 # ============================================================================
 
-TAX_RATE = 0.0975  # 9.75% Tennessee tax rate
+TAX_RATE_PER_10000 = 975  # 9.75% Tennessee tax rate, in hundredths of a percent
+TAX_RATE = TAX_RATE_PER_10000 / 10000
+
+# Columns that the update_* helpers may write
+_CUSTOMER_FIELDS = frozenset({'name', 'phone', 'email', 'address', 'tax_exempt',
+                              'tax_exempt_certificate', 'out_of_state'})
+_PART_FIELDS = frozenset({'part_number', 'name', 'stock_quantity', 'price', 'supplier_name',
+                          'cost_from_supplier', 'retail_price', 'taxable'})
+_NEW_ENGINE_FIELDS = frozenset({'hp', 'model', 'serial_number', 'status', 'customer_id',
+                                'boat_id', 'date_sold', 'date_installed', 'date_transferred',
+                                'transferred_to', 'purchase_price', 'sale_price', 'paid_in_full',
+                                'registered_with_tohatsu', 'registration_date', 'notes'})
+_MECHANIC_FIELDS = frozenset({'name', 'hourly_rate', 'phone', 'email'})
+
+# Columns the list_* helpers may select, and the ones they select by default
+# (what the list screens render). columns=None or list_*_full() selects whole rows.
+_SELECTABLE_COLUMNS = {
+    'Customers': _CUSTOMER_FIELDS | {'customer_id'},
+    'Parts': _PART_FIELDS | {'part_id'},
+    'NewEngines': _NEW_ENGINE_FIELDS | {'new_engine_id'},
+    'Estimates': frozenset({'estimate_id', 'customer_id', 'boat_id', 'engine_id', 'date_created',
+                            'insurance_company', 'claim_number', 'notes', 'subtotal',
+                            'tax_amount', 'total'}),
+}
+_CUSTOMER_LIST_COLUMNS = ('customer_id', 'name', 'phone', 'email', 'tax_exempt', 'out_of_state')
+_PART_LIST_COLUMNS = ('part_id', 'part_number', 'name', 'stock_quantity', 'price',
+                      'supplier_name', 'cost_from_supplier', 'retail_price', 'taxable')
+_NEW_ENGINE_LIST_COLUMNS = ('new_engine_id', 'hp', 'model', 'serial_number', 'status',
+                            'customer_id', 'date_installed', 'paid_in_full',
+                            'registered_with_tohatsu')
+_ESTIMATE_LIST_COLUMNS = ('estimate_id', 'customer_id', 'date_created', 'subtotal',
+                          'tax_amount', 'total')
 
 
 # ============================================================================
 # DATABASE HELPERS
 # ============================================================================
 
+# Applied once when each connection is opened
+_CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -64000;
+    PRAGMA mmap_size = 268435456;
+"""
+
+# One connection per thread, opened on first use and reused afterwards
+_tls = threading.local()
+_connection_generation = 0
+
+
 def _get_connection():
-    """Get database connection."""
-    return sqlite3.connect(get_db_path())
+    """Get this thread's database connection (autocommit mode)."""
+    conn = getattr(_tls, 'conn', None)
+    if conn is not None and _tls.generation != _connection_generation:
+        # close_connections() ran since this thread connected; reconnect
+        conn.close()
+        conn = None
+    if conn is None:
+        conn = sqlite3.connect(_DB_PATH, timeout=10.0, isolation_level=None,
+                               cached_statements=256)
+        conn.executescript(_CONNECTION_PRAGMAS)
+        conn.row_factory = sqlite3.Row
+        _tls.conn = conn
+        _tls.generation = _connection_generation
+    return conn
+
+
+def close_connections():
+    """Close this thread's connection and have every other thread reconnect on its next call.
+    
+    Other threads close their own connections (a connection is only ever used by
+    the thread that opened it, so one in the middle of a query is never closed under it).
+    """
+    global _connection_generation
+    _connection_generation += 1
+    conn = getattr(_tls, 'conn', None)
+    if conn is not None:
+        _tls.conn = None
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+atexit.register(close_connections)
+
+
+@contextmanager
+def transaction():
+    """
+    Run a block of helper calls as one transaction on this thread's connection.
+    
+    Commits when the block finishes and rolls back if it raises. Nested uses
+    join the outer transaction.
+    """
+    conn = _get_connection()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        # SQLite may already have rolled back (e.g. SQLITE_FULL); keep the original error
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+@contextmanager
+def read_snapshot():
+    """
+    Run a block of reads against one snapshot on this thread's connection.
+    
+    A deferred BEGIN, so no write lock is taken; every query in the block sees
+    the same data. Nested uses (or use inside transaction()) join the outer one.
+    """
+    conn = _get_connection()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN")
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        # SQLite may already have rolled back (e.g. SQLITE_FULL); keep the original error
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+def _row_dict(row: Optional[sqlite3.Row]) -> Optional[Dict]:
+    """Convert a fetched row to a plain dict for callers (None passes through)."""
+    return dict(row) if row is not None else None
+
+
+_FETCH_BATCH_SIZE = 500
+
+
+def _iter_query(sql: str, params: tuple = ()) -> Iterator[Dict]:
+    """Run a read query and yield dict rows in batches."""
+    cur = _get_connection().cursor()
+    cur.execute(sql, params)
+    while True:
+        rows = cur.fetchmany(_FETCH_BATCH_SIZE)
+        if not rows:
+            break
+        yield from map(dict, rows)
+
+
+# INSERT/UPDATE ... RETURNING is available from SQLite 3.35
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
 
 
-def _dict_factory(cursor, row):
-    """Convert row to dictionary."""
-    d = {}
-    for idx, col in enumerate(cursor.description):
-        d[col[0]] = row[idx]
-    return d
+def _returning(sql: str, column: str) -> str:
+    """Append a RETURNING clause to a write statement when supported."""
+    return f"{sql} RETURNING {column}" if _HAS_RETURNING else sql
+
+
+def _inserted_id(cur) -> int:
+    """Get the id of the row inserted by a _returning() INSERT."""
+    if _HAS_RETURNING:
+        rows = cur.fetchall()
+        return rows[0][0] if rows else 0
+    return cur.lastrowid
+
+
+def _affected(cur) -> bool:
+    """Check whether a _returning() UPDATE/DELETE touched any row."""
+    if _HAS_RETURNING:
+        return bool(cur.fetchall())
+    return cur.rowcount > 0
+
+
+@lru_cache(maxsize=128)
+def _build_update_sql(table: str, key_column: str,
+                      columns: frozenset) -> Tuple[str, Tuple[str, ...]]:
+    """Get (sql, ordered_columns) for an UPDATE of the given columns, built once per column set."""
+    ordered = tuple(sorted(columns))
+    set_clause = ', '.join(f"{c} = ?" for c in ordered)
+    return _returning(f"UPDATE {table} SET {set_clause} WHERE {key_column} = ?", '1'), ordered
+
+
+@lru_cache(maxsize=128)
+def _select_list(table: str, columns: Optional[Tuple[str, ...]], prefix: str = '') -> str:
+    """Get the select list for the given columns of table (None selects every column)."""
+    if columns is None:
+        return f"{prefix}*"
+    unknown = set(columns) - _SELECTABLE_COLUMNS[table]
+    if unknown:
+        raise ValueError(f"Unknown {table} column(s): {', '.join(sorted(unknown))}")
+    return ', '.join(f"{prefix}{c}" for c in columns)
+
+
+def _columns_key(columns: Optional[Sequence[str]]) -> Optional[Tuple[str, ...]]:
+    """Normalize a columns argument into a hashable _select_list() key."""
+    return None if columns is None else tuple(columns)
+
+
+_UPDATABLE_FIELDS = {
+    'Customers': _CUSTOMER_FIELDS,
+    'Parts': _PART_FIELDS,
+    'NewEngines': _NEW_ENGINE_FIELDS,
+    'Mechanics': _MECHANIC_FIELDS,
+}
+
+
+def _update_row(table: str, key_column: str, key_value: int, fields: Dict) -> bool:
+    """Update the whitelisted columns in fields for one row. Returns success boolean."""
+    columns = fields.keys() & _UPDATABLE_FIELDS[table]
+    if not columns:
+        return False
+    
+    sql, ordered = _build_update_sql(table, key_column, frozenset(columns))
+    values = [fields[c] for c in ordered]
+    values.append(key_value)
+    
+    cur = _get_connection().cursor()
+    cur.execute(sql, values)
+    return _affected(cur)
+
+
+# [expires_at, 'YYYY-MM-DD'] - refreshed at local midnight
+_today_cache = [0.0, '']
+
+
+def _today_iso() -> str:
+    """Get today's date as YYYY-MM-DD, cached until the day changes."""
+    if time.time() >= _today_cache[0]:
+        today = date.today()
+        tomorrow = datetime.combine(today + timedelta(days=1), datetime.min.time())
+        _today_cache[:] = [tomorrow.timestamp(), today.isoformat()]
+    return _today_cache[1]
 
 
 # ============================================================================
 # CUSTOMER OPERATIONS
 # ============================================================================
 
+_INSERT_CUSTOMER_SQL = """
+    INSERT INTO Customers (name, phone, email, address, tax_exempt,
+                          tax_exempt_certificate, out_of_state)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_CUSTOMER_RETURNING_SQL = _returning(_INSERT_CUSTOMER_SQL, 'customer_id')
+
+
 def create_customer(name: str, phone: Optional[str] = None, email: Optional[str] = None, 
                    address: Optional[str] = None, tax_exempt: int = 0,
                    tax_exempt_certificate: Optional[str] = None, 
@@ -288,85 +606,226 @@ def create_customer(name: str, phone: Optional[str] = None, email: Optional[str]
     """Create a new customer. Returns customer_id."""
     conn = _get_connection()
     cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO Customers (name, phone, email, address, tax_exempt, 
-                              tax_exempt_certificate, out_of_state)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (name, phone, email, address, tax_exempt, tax_exempt_certificate, out_of_state))
-    conn.commit()
-    customer_id = cur.lastrowid
-    conn.close()
+    cur.execute(_INSERT_CUSTOMER_RETURNING_SQL, (name, phone, email, address, tax_exempt, tax_exempt_certificate, out_of_state))
+    customer_id = _inserted_id(cur)
     return int(customer_id) if customer_id else 0
 
 
 def get_customer(customer_id: int) -> Optional[Dict]:
     """Get customer by ID. Returns dict or None."""
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
     cur.execute("SELECT * FROM Customers WHERE customer_id = ?", (customer_id,))
-    result = cur.fetchone()
-    conn.close()
+    result = _row_dict(cur.fetchone())
     return result
 
 
 def update_customer(customer_id: int, **fields) -> bool:
     """Update customer fields. Returns success boolean."""
-    if not fields:
-        return False
-    
-    allowed_fields = {'name', 'phone', 'email', 'address', 'tax_exempt', 
-                     'tax_exempt_certificate', 'out_of_state'}
-    updates = {k: v for k, v in fields.items() if k in allowed_fields}
-    
-    if not updates:
-        return False
-    
-    set_clause = ', '.join(f"{k} = ?" for k in updates.keys())
-    values = list(updates.values()) + [customer_id]
+    return _update_row('Customers', 'customer_id', customer_id, fields)
+
+
+def list_customers(columns: Optional[Sequence[str]] = _CUSTOMER_LIST_COLUMNS,
+                   order_by: str = 'name', descending: bool = False) -> List[Dict]:
+    """List all customers with the given columns (default: the customer list columns).
     
+    Rows are sorted by order_by (any Customers column; text ignores case) in SQLite.
+    """
+    select = _select_list('Customers', _columns_key(columns))
+    if order_by not in _SELECTABLE_COLUMNS['Customers']:
+        raise ValueError(f"Unknown Customers column(s): {order_by}")
+    direction = 'DESC' if descending else 'ASC'
     conn = _get_connection()
     cur = conn.cursor()
-    cur.execute(f"UPDATE Customers SET {set_clause} WHERE customer_id = ?", values)
-    conn.commit()
-    success = cur.rowcount > 0
-    conn.close()
-    return success
+    cur.execute(f"SELECT {select} FROM Customers ORDER BY {order_by} COLLATE NOCASE {direction}")
+    results = [dict(row) for row in cur.fetchall()]
+    return results
+
 
+def list_customers_full() -> List[Dict]:
+    """List all customers with every column."""
+    return list_customers(columns=None)
 
-def list_customers() -> List[Dict]:
-    """List all customers."""
+
+def count_customers() -> int:
+    """Count all customers."""
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
-    cur.execute("SELECT * FROM Customers ORDER BY name")
-    results = cur.fetchall()
-    conn.close()
-    return results
+    cur.execute("SELECT COUNT(*) FROM Customers")
+    return cur.fetchone()[0]
+
+
+def list_customer_choices() -> List[Tuple[int, str]]:
+    """List (customer_id, "id - name") pairs ordered by name, for customer pickers."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.row_factory = None  # plain tuples; the label is already formatted by SQLite
+    cur.execute("SELECT customer_id, printf('%d - %s', customer_id, name) FROM Customers "
+                "ORDER BY name COLLATE NOCASE")
+    return cur.fetchall()
 
 
 def get_customer_boats(customer_id: int) -> List[Dict]:
     """Get all boats for a customer."""
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
     cur.execute("SELECT * FROM Boats WHERE customer_id = ? ORDER BY year DESC", (customer_id,))
-    result = cur.fetchall()
-    conn.close()
+    result = [dict(row) for row in cur.fetchall()]
+    return result
+
+
+def list_boat_choices(customer_id: int) -> List[Tuple[int, str]]:
+    """List a customer's (boat_id, "id - year make model") pairs, newest first, for boat pickers."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.row_factory = None  # plain tuples; the label is already formatted by SQLite
+    cur.execute("""
+        SELECT boat_id, printf('%d - %s %s %s', boat_id, year, make, model)
+        FROM Boats WHERE customer_id = ? ORDER BY year DESC
+    """, (customer_id,))
+    return cur.fetchall()
+
+
+def get_boat(boat_id: int) -> Optional[Dict]:
+    """Get boat by ID. Returns dict or None."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT * FROM Boats WHERE boat_id = ?", (boat_id,))
+    result = _row_dict(cur.fetchone())
+    return result
+
+
+def get_boat_by_vin(vin: str) -> Optional[Dict]:
+    """Get boat by VIN with its owner's name (customer_name). Returns dict or None."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT b.*, c.name as customer_name
+        FROM Boats b
+        JOIN Customers c ON b.customer_id = c.customer_id
+        WHERE b.vin = ?
+    """, (vin,))
+    result = _row_dict(cur.fetchone())
+    return result
+
+
+_TRANSFER_BOAT_SQL = _returning("UPDATE Boats SET customer_id = ? WHERE boat_id = ?", '1')
+
+
+def transfer_boat(boat_id: int, customer_id: int) -> bool:
+    """Move a boat to another customer. Returns success boolean."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.execute(_TRANSFER_BOAT_SQL, (customer_id, boat_id))
+    return _affected(cur)
+
+
+def get_engine(engine_id: int) -> Optional[Dict]:
+    """Get engine by ID. Returns dict or None."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT * FROM Engines WHERE engine_id = ?", (engine_id,))
+    result = _row_dict(cur.fetchone())
     return result
 
 
 def get_boat_engines(boat_id: int) -> List[Dict]:
     """Get all engines for a boat."""
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
     cur.execute("SELECT * FROM Engines WHERE boat_id = ?", (boat_id,))
-    result = cur.fetchall()
-    conn.close()
+    result = [dict(row) for row in cur.fetchall()]
     return result
 
 
+def list_engine_choices(boat_id: int) -> List[Tuple[int, str]]:
+    """List a boat's (engine_id, "id - make model (hp HP type)") pairs, for engine pickers."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.row_factory = None  # plain tuples; the label is already formatted by SQLite
+    cur.execute("""
+        SELECT engine_id, printf('%d - %s %s (%s HP%s)', engine_id, make, model, hp,
+                                 COALESCE(' ' || NULLIF(engine_type, ''), ''))
+        FROM Engines WHERE boat_id = ? ORDER BY engine_id
+    """, (boat_id,))
+    return cur.fetchall()
+
+
+_INSERT_BOAT_SQL = _returning("""
+    INSERT INTO Boats (customer_id, year, make, model, vin, color1, color2, color3)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+""", 'boat_id')
+
+
+def create_boat(customer_id: int, year: Optional[int] = None, make: Optional[str] = None,
+                model: Optional[str] = None, vin: Optional[str] = None,
+                color1: Optional[str] = None, color2: Optional[str] = None,
+                color3: Optional[str] = None) -> int:
+    """Create a boat for a customer. Returns boat_id."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.execute(_INSERT_BOAT_SQL, (customer_id, year, make, model, vin, color1, color2, color3))
+    boat_id = _inserted_id(cur)
+    return int(boat_id) if boat_id else 0
+
+
+_INSERT_ENGINE_SQL = _returning("""
+    INSERT INTO Engines (boat_id, engine_type, make, model, hp, serial_number, year, outdrive)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+""", 'engine_id')
+
+
+def create_engine(boat_id: int, engine_type: Optional[str] = None, make: Optional[str] = None,
+                  model: Optional[str] = None, hp: Optional[float] = None,
+                  serial_number: Optional[str] = None, year: Optional[int] = None,
+                  outdrive: Optional[str] = None) -> int:
+    """Create an engine on a boat. Returns engine_id."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.execute(_INSERT_ENGINE_SQL, (boat_id, engine_type, make, model, hp, serial_number, year, outdrive))
+    engine_id = _inserted_id(cur)
+    return int(engine_id) if engine_id else 0
+
+
+_UPDATE_CUSTOMER_ALL_SQL = """
+    UPDATE Customers
+    SET name = ?, phone = ?, email = ?, address = ?, tax_exempt = ?,
+        tax_exempt_certificate = ?, out_of_state = ?
+    WHERE customer_id = ?
+"""
+
+
+def _save_imported_customers(inserts: Dict[str, tuple], repeats: Dict[str, int],
+                             updates: List[tuple], errors: List[str]) -> Tuple[int, int]:
+    """Save imported customers one row at a time in one transaction, skipping rows that fail.
+    
+    Returns (created_count, updated_count) for the rows actually saved.
+    """
+    created_count = 0
+    updated_count = 0
+    updated_ids = set()
+    with transaction() as conn:
+        for key, (row_idx, values) in inserts.items():
+            try:
+                conn.execute(_INSERT_CUSTOMER_SQL, values)
+            except sqlite3.IntegrityError as e:
+                errors.append(f"Row {row_idx}: {str(e)}")
+                continue
+            created_count += 1
+            updated_count += repeats.get(key, 0)
+        for row_idx, values in updates:
+            try:
+                conn.execute(_UPDATE_CUSTOMER_ALL_SQL, values)
+            except sqlite3.IntegrityError as e:
+                errors.append(f"Row {row_idx}: {str(e)}")
+                continue
+            updated_count += 1
+            updated_ids.add(values[-1])
+        for customer_id in updated_ids:
+            recalculate_customer_tickets(customer_id)
+    return created_count, updated_count
+
+
 def import_customers_from_excel(file_path: str) -> Tuple[int, int, List[str]]:
     """Import customers from Excel file. Returns (created_count, updated_count, errors).
     
@@ -423,6 +882,18 @@ def import_customers_from_excel(file_path: str) -> Tuple[int, int, List[str]]:
         if 'name' not in col_map:
             return (0, 0, ["Excel file must have a 'Name' column"])
         
+        # Existing customers by lower-cased name (the oldest wins, as a per-row lookup would)
+        existing_ids: Dict[str, int] = {}
+        for customer_id, existing_name in _get_connection().execute(
+                "SELECT customer_id, name FROM Customers ORDER BY customer_id"):
+            existing_ids.setdefault(existing_name.lower(), customer_id)
+        
+        # New customers by lower-cased name as (row number, values); a name repeated in the
+        # sheet updates the pending row and is counted in repeats
+        inserts: Dict[str, tuple] = {}
+        repeats: Dict[str, int] = {}
+        updates = []
+        
         # Process rows (skip header)
         for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):  # type: ignore
             try:
@@ -451,46 +922,45 @@ def import_customers_from_excel(file_path: str) -> Tuple[int, int, List[str]]:
                     val = str(row[col_map['out_of_state']]).strip().lower()
                     out_of_state = 1 if val in ('1', 'yes', 'true', 'y') else 0
                 
-                # Check if customer exists by name (simple match)
-                conn = _get_connection()
-                conn.row_factory = _dict_factory
-                cur = conn.cursor()
-                cur.execute("SELECT customer_id FROM Customers WHERE LOWER(name) = LOWER(?)", (name,))
-                existing = cur.fetchone()
+                values = (name, phone, email, address, tax_exempt, tax_exempt_certificate, out_of_state)
                 
-                if existing:
+                # Check if customer exists by name (simple match)
+                key = name.lower()
+                if key in existing_ids:
                     # Update existing customer
-                    update_customer(
-                        existing['customer_id'],
-                        name=name,
-                        phone=phone,
-                        email=email,
-                        address=address,
-                        tax_exempt=tax_exempt,
-                        tax_exempt_certificate=tax_exempt_certificate,
-                        out_of_state=out_of_state
-                    )
-                    updated_count += 1
+                    updates.append((row_idx, values + (existing_ids[key],)))
+                elif key in inserts:
+                    # Created earlier in this sheet - the later row's values win
+                    inserts[key] = (row_idx, values)
+                    repeats[key] = repeats.get(key, 0) + 1
                 else:
                     # Create new customer
-                    create_customer(
-                        name,
-                        phone,
-                        email,
-                        address,
-                        tax_exempt,
-                        tax_exempt_certificate,
-                        out_of_state
-                    )
-                    created_count += 1
-                
-                conn.close()
+                    inserts[key] = (row_idx, values)
                 
             except Exception as e:
                 errors.append(f"Row {row_idx}: {str(e)}")
         
         wb.close()
         
+        # Write the whole sheet as one transaction with one prepared statement per kind
+        try:
+            with transaction() as conn:
+                conn.executemany(_INSERT_CUSTOMER_SQL, (values for _, values in inserts.values()))
+                conn.executemany(_UPDATE_CUSTOMER_ALL_SQL, (values for _, values in updates))
+                # Updated tax status changes the totals on their tickets
+                for customer_id in {values[-1] for _, values in updates}:
+                    recalculate_customer_tickets(customer_id)
+            created_count = len(inserts)
+            updated_count = len(updates) + sum(repeats.values())
+        except sqlite3.IntegrityError:
+            # A row broke a constraint and the batch rolled back; save row by row instead
+            try:
+                created_count, updated_count = _save_imported_customers(inserts, repeats, updates, errors)
+            except sqlite3.Error as e:
+                errors.append(f"Failed to save customers: {str(e)}")
+        except sqlite3.Error as e:
+            errors.append(f"Failed to save customers: {str(e)}")
+        
     except Exception as e:
         errors.append(f"Failed to read Excel file: {str(e)}")
     
@@ -507,62 +977,70 @@ def create_part(part_number: Optional[str] = None, name: str = "", stock_quantit
     """Create a new part. Returns part_id."""
     conn = _get_connection()
     cur = conn.cursor()
-    cur.execute("""
+    cur.execute(_returning("""
         INSERT INTO Parts (part_number, name, stock_quantity, price,
                           supplier_name, cost_from_supplier, retail_price, taxable)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (part_number, name, stock_quantity, price, supplier_name,
+    """, 'part_id'), (part_number, name, stock_quantity, price, supplier_name,
           cost_from_supplier, retail_price, taxable))
-    conn.commit()
-    part_id = cur.lastrowid
-    conn.close()
+    part_id = _inserted_id(cur)
     return int(part_id) if part_id else 0
 
 
 def get_part(part_id: int) -> Optional[Dict]:
     """Get part by ID. Returns dict or None."""
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
     cur.execute("SELECT * FROM Parts WHERE part_id = ?", (part_id,))
-    result = cur.fetchone()
-    conn.close()
+    result = _row_dict(cur.fetchone())
     return result
 
 
 def update_part(part_id: int, **fields) -> bool:
     """Update part fields. Returns success boolean."""
-    if not fields:
-        return False
-    
-    allowed_fields = {'part_number', 'name', 'stock_quantity', 'price', 'supplier_name', 
-                     'cost_from_supplier', 'retail_price', 'taxable'}
-    updates = {k: v for k, v in fields.items() if k in allowed_fields}
-    
-    if not updates:
-        return False
-    
-    set_clause = ', '.join(f"{k} = ?" for k in updates.keys())
-    values = list(updates.values()) + [part_id]
+    return _update_row('Parts', 'part_id', part_id, fields)
+
+
+def list_parts(limit: Optional[int] = None, offset: int = 0,
+               columns: Optional[Sequence[str]] = _PART_LIST_COLUMNS) -> List[Dict]:
+    """List all parts, or one page of them when limit is given."""
+    return list(list_parts_iter(limit, offset, columns))
+
+
+def list_parts_full(limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+    """List all parts with every column."""
+    return list_parts(limit, offset, columns=None)
+
+
+def list_parts_iter(limit: Optional[int] = None, offset: int = 0,
+                    columns: Optional[Sequence[str]] = _PART_LIST_COLUMNS) -> Iterator[Dict]:
+    """Yield parts ordered by name without loading the whole table at once.
     
-    conn = _get_connection()
-    cur = conn.cursor()
-    cur.execute(f"UPDATE Parts SET {set_clause} WHERE part_id = ?", values)
-    conn.commit()
-    success = cur.rowcount > 0
-    conn.close()
-    return success
+    part_id breaks ties so LIMIT/OFFSET pages never overlap.
+    """
+    select = _select_list('Parts', _columns_key(columns))
+    if limit is None:
+        return _iter_query(f"SELECT {select} FROM Parts ORDER BY name, part_id")
+    return _iter_query(f"SELECT {select} FROM Parts ORDER BY name, part_id LIMIT ? OFFSET ?",
+                       (limit, offset))
+
 
+_PART_CHOICE_LABEL = "printf('%d - %s ($%.2f)', part_id, name, price)"
+_PART_CHOICE_LABEL_PN = ("printf('%d - %s%s ($%.2f)', part_id, name, "
+                         "CASE WHEN part_number <> '' THEN ' (PN: ' || part_number || ')' ELSE '' END, price)")
 
-def list_parts() -> List[Dict]:
-    """List all parts."""
+
+def list_part_choices(with_part_number: bool = False) -> List[Tuple[int, str]]:
+    """List (part_id, "id - name ($price)") pairs ordered by name, for part pickers.
+    
+    with_part_number adds " (PN: ...)" after the name for parts that have one.
+    """
+    label = _PART_CHOICE_LABEL_PN if with_part_number else _PART_CHOICE_LABEL
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
-    cur.execute("SELECT * FROM Parts ORDER BY name")
-    results = cur.fetchall()
-    conn.close()
-    return results
+    cur.row_factory = None  # plain tuples; the label is already formatted by SQLite
+    cur.execute(f"SELECT part_id, {label} FROM Parts ORDER BY name")
+    return cur.fetchall()
 
 
 # ============================================================================
@@ -574,24 +1052,20 @@ def create_new_engine(hp: int, model: str, serial_number: str,
     """Create a new engine in inventory. Returns new_engine_id."""
     conn = _get_connection()
     cur = conn.cursor()
-    cur.execute("""
+    cur.execute(_returning("""
         INSERT INTO NewEngines (hp, model, serial_number, status, purchase_price, notes)
         VALUES (?, ?, ?, 'In Stock', ?, ?)
-    """, (hp, model, serial_number, purchase_price, notes))
-    conn.commit()
-    engine_id = cur.lastrowid
-    conn.close()
+    """, 'new_engine_id'), (hp, model, serial_number, purchase_price, notes))
+    engine_id = _inserted_id(cur)
     return int(engine_id) if engine_id else 0
 
 
 def get_new_engine(new_engine_id: int) -> Optional[Dict]:
     """Get new engine by ID. Returns dict or None."""
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
     cur.execute("SELECT * FROM NewEngines WHERE new_engine_id = ?", (new_engine_id,))
-    result = cur.fetchone()
-    conn.close()
+    result = _row_dict(cur.fetchone())
     return result
 
 
@@ -600,73 +1074,64 @@ def sell_new_engine(new_engine_id: int, customer_id: int, boat_id: Optional[int]
                    date_installed: Optional[str] = None, paid_in_full: int = 0) -> bool:
     """Mark engine as sold to customer. Returns success boolean."""
     if date_sold is None:
-        date_sold = datetime.now().strftime('%Y-%m-%d')
+        date_sold = _today_iso()
     
     conn = _get_connection()
     cur = conn.cursor()
-    cur.execute("""
+    cur.execute(_returning("""
         UPDATE NewEngines 
         SET status = 'Sold', customer_id = ?, boat_id = ?, sale_price = ?,
             date_sold = ?, date_installed = ?, paid_in_full = ?
         WHERE new_engine_id = ? AND status = 'In Stock'
-    """, (customer_id, boat_id, sale_price, date_sold, date_installed, 
+    """, '1'), (customer_id, boat_id, sale_price, date_sold, date_installed, 
           paid_in_full, new_engine_id))
-    conn.commit()
-    success = cur.rowcount > 0
-    conn.close()
+    success = _affected(cur)
     return success
 
 
 def update_new_engine(new_engine_id: int, **fields) -> bool:
     """Update new engine fields. Returns success boolean."""
-    if not fields:
-        return False
-    
-    allowed_fields = {'hp', 'model', 'serial_number', 'status', 'customer_id',
-                     'boat_id', 'date_sold', 'date_installed', 'date_transferred',
-                     'transferred_to', 'purchase_price', 'sale_price', 'paid_in_full',
-                     'registered_with_tohatsu', 'registration_date', 'notes'}
-    updates = {k: v for k, v in fields.items() if k in allowed_fields}
-    
-    if not updates:
-        return False
-    
-    set_clause = ', '.join(f"{k} = ?" for k in updates.keys())
-    values = list(updates.values()) + [new_engine_id]
-    
-    conn = _get_connection()
-    cur = conn.cursor()
-    cur.execute(f"UPDATE NewEngines SET {set_clause} WHERE new_engine_id = ?", values)
-    conn.commit()
-    success = cur.rowcount > 0
-    conn.close()
-    return success
+    return _update_row('NewEngines', 'new_engine_id', new_engine_id, fields)
 
 
-def list_new_engines(status: Optional[str] = None) -> List[Dict]:
+def list_new_engines(status: Optional[str] = None,
+                     columns: Optional[Sequence[str]] = _NEW_ENGINE_LIST_COLUMNS) -> List[Dict]:
     """List new engines, optionally filtered by status."""
+    select = _select_list('NewEngines', _columns_key(columns))
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
     
     if status:
-        cur.execute("SELECT * FROM NewEngines WHERE status = ? ORDER BY new_engine_id", (status,))
+        cur.execute(f"SELECT {select} FROM NewEngines WHERE status = ? ORDER BY new_engine_id", (status,))
     else:
-        cur.execute("SELECT * FROM NewEngines ORDER BY new_engine_id")
+        cur.execute(f"SELECT {select} FROM NewEngines ORDER BY new_engine_id")
     
-    results = cur.fetchall()
-    conn.close()
+    results = [dict(row) for row in cur.fetchall()]
     return results
 
 
+def list_new_engines_full(status: Optional[str] = None) -> List[Dict]:
+    """List new engines with every column, optionally filtered by status."""
+    return list_new_engines(status, columns=None)
+
+
+def count_engines(status: Optional[str] = None) -> int:
+    """Count new engines, optionally filtered by status."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    if status:
+        cur.execute("SELECT COUNT(*) FROM NewEngines WHERE status = ?", (status,))
+    else:
+        cur.execute("SELECT COUNT(*) FROM NewEngines")
+    return cur.fetchone()[0]
+
+
 def get_engines_needing_registration() -> List[Dict]:
     """Get engines that need Tohatsu registration (sold, paid, installed >30 days, not registered)."""
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
     
-    thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-    
+    # SQLite works out the cutoff itself; 'localtime' keeps it on the same calendar as date.today()
     cur.execute("""
         SELECT ne.*, c.name as customer_name, c.phone as customer_phone
         FROM NewEngines ne
@@ -674,13 +1139,12 @@ def get_engines_needing_registration() -> List[Dict]:
         WHERE ne.status = 'Sold'
           AND ne.paid_in_full = 1
           AND ne.date_installed IS NOT NULL
-          AND ne.date_installed <= ?
+          AND ne.date_installed <= date('now', 'localtime', '-30 days')
           AND ne.registered_with_tohatsu = 0
         ORDER BY ne.date_installed
-    """, (thirty_days_ago,))
+    """)
     
-    results = cur.fetchall()
-    conn.close()
+    results = [dict(row) for row in cur.fetchall()]
     return results
 
 
@@ -688,17 +1152,64 @@ def get_engines_needing_registration() -> List[Dict]:
 # TAX CALCULATION
 # ============================================================================
 
+# Customer columns selected alongside a ticket/estimate for calculate_tax
+_TAX_CUSTOMER_COLUMNS = """c.customer_id as tax_customer_id, c.tax_exempt,
+               c.tax_exempt_certificate, c.out_of_state"""
+
+
+def _tax_customer(row: sqlite3.Row) -> Optional[sqlite3.Row]:
+    """Get the row carrying the customer fields joined via _TAX_CUSTOMER_COLUMNS, or None if no customer matched."""
+    if row['tax_customer_id'] is None:
+        return None
+    return row
+
+
+def _to_cents(amount: Decimal) -> int:
+    """Round an exact dollar amount half-up to whole cents."""
+    return int((amount * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def _line_amount(item: Dict) -> Decimal:
+    """Exact dollar amount of a tax line item: quantity * price when given, else amount."""
+    if 'quantity' in item:
+        return Decimal(str(item['quantity'])) * Decimal(str(item['price']))
+    return Decimal(str(item['amount']))
+
+
+def _sum_line_items(line_items: List[Dict], with_taxable: bool = True) -> Tuple[Decimal, Decimal]:
+    """Return exact (subtotal, taxable_amount) in dollars for a list of tax line items.
+    
+    Nothing is rounded here; callers round the sums to the cent once.
+    with_taxable=False skips the taxable filter (taxable_amount comes back 0).
+    """
+    if not with_taxable:
+        return sum(map(_line_amount, line_items), Decimal(0)), Decimal(0)
+    
+    # Single pass over the line items for both subtotal and taxable amount
+    subtotal = Decimal(0)
+    taxable_amount = Decimal(0)
+    for item in line_items:
+        amount = _line_amount(item)
+        subtotal += amount
+        if item.get('taxable', 1) == 1:
+            taxable_amount += amount
+    return subtotal, taxable_amount
+
+
 def calculate_tax(customer_id: int, line_items: List[Dict], 
                  payment_method: Optional[str] = None, 
-                 new_engine_sale_price: float = 0.0) -> Tuple[float, float, float]:
+                 new_engine_sale_price: float = 0.0, *,
+                 customer: Optional[Dict] = None) -> Tuple[float, float, float]:
     """
     Calculate subtotal, tax, and total for a transaction.
     
     Args:
         customer_id: Customer ID
-        line_items: List of dicts with keys: 'amount', 'taxable' (0 or 1)
+        line_items: List of dicts with keys: 'amount' (or 'quantity' and 'price'), 'taxable' (0 or 1)
         payment_method: Payment method ('Cash', 'Credit Card', 'Check', etc.)
         new_engine_sale_price: Price of new engine if sold (for out-of-state exemption)
+        customer: Customer dict or sqlite3.Row if the caller already has it (must
+                  include tax_exempt, tax_exempt_certificate, out_of_state); looked up when omitted
     
     Returns:
         Tuple of (subtotal, tax_amount, total)
@@ -709,38 +1220,39 @@ def calculate_tax(customer_id: int, line_items: List[Dict],
         3. Cash payment → Only taxable parts are taxed at 9.75%
         4. Default → 9.75% tax on all taxable items
     """
-    customer = get_customer(customer_id)
+    if customer is None:
+        customer = get_customer(customer_id)
     if not customer:
         raise ValueError(f"Customer {customer_id} not found")
     
-    subtotal = sum(item['amount'] for item in line_items)
-    if new_engine_sale_price > 0:
-        subtotal += new_engine_sale_price
+    # Amounts are summed exactly, rounded to integer cents once and converted
+    # back to dollars on return
     
-    # Rule 1: Tax-exempt customer
-    if customer.get('tax_exempt') == 1 and customer.get('tax_exempt_certificate'):
-        return (subtotal, 0.0, subtotal)
+    # Rule 1: Tax-exempt customer (nothing is taxed, so only the subtotal is needed)
+    exempt = customer['tax_exempt'] == 1 and bool(customer['tax_exempt_certificate'])
     
-    # Calculate taxable amount
-    taxable_amount = 0.0
+    subtotal, taxable_amount = _sum_line_items(line_items, with_taxable=not exempt)
+    engine_price = Decimal(str(new_engine_sale_price)) if new_engine_sale_price else Decimal(0)
+    if engine_price > 0:
+        subtotal += engine_price
+    subtotal = _to_cents(subtotal)
+    
+    if exempt:
+        return (subtotal / 100, 0.0, subtotal / 100)
     
     # Rule 2: Out-of-state customer with new engine
-    if customer.get('out_of_state') == 1 and new_engine_sale_price > 0:
-        # New engine is tax-exempt, but other taxable items are taxed
-        taxable_amount = sum(item['amount'] for item in line_items if item.get('taxable', 1) == 1)
-    else:
+    # New engine is tax-exempt, but other taxable items are taxed
+    if engine_price > 0 and customer['out_of_state'] != 1:
         # Include all taxable items (engine + parts/labor)
-        if new_engine_sale_price > 0:
-            taxable_amount = new_engine_sale_price
-        taxable_amount += sum(item['amount'] for item in line_items if item.get('taxable', 1) == 1)
+        taxable_amount += engine_price
     
     # Rule 3: Cash payment - already handled above (only taxable items included)
     # Rule 4: Default - already handled above (all taxable items included)
     
-    tax_amount = round(taxable_amount * TAX_RATE, 2)
-    total = round(subtotal + tax_amount, 2)
+    tax_amount = _to_cents(taxable_amount * TAX_RATE_PER_10000 / 10000)
+    total = subtotal + tax_amount
     
-    return (subtotal, tax_amount, total)
+    return (subtotal / 100, tax_amount / 100, total / 100)
 
 
 # ============================================================================
@@ -751,73 +1263,100 @@ def create_estimate(customer_id: int, boat_id: Optional[int] = None, engine_id:
                    insurance_company: Optional[str] = None, claim_number: Optional[str] = None,
                    notes: Optional[str] = None) -> int:
     """Create a new estimate. Returns estimate_id."""
-    date_created = datetime.now().strftime('%Y-%m-%d')
+    date_created = _today_iso()
     
     conn = _get_connection()
     cur = conn.cursor()
-    cur.execute("""
+    cur.execute(_returning("""
         INSERT INTO Estimates (customer_id, boat_id, engine_id, date_created,
                               insurance_company, claim_number, notes)
         VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (customer_id, boat_id, engine_id, date_created, insurance_company, 
+    """, 'estimate_id'), (customer_id, boat_id, engine_id, date_created, insurance_company, 
           claim_number, notes))
-    conn.commit()
-    estimate_id = cur.lastrowid
-    conn.close()
+    estimate_id = _inserted_id(cur)
     return int(estimate_id) if estimate_id else 0
 
 
-def add_estimate_line_item(estimate_id: int, item_type: str, description: str,
-                          quantity: float = 1.0, unit_price: float = 0.0) -> int:
-    """Add line item to estimate. Returns line_item_id."""
+_INSERT_ESTIMATE_LINE_ITEM_SQL = """
+        INSERT INTO EstimateLineItems (estimate_id, item_type, description, 
+                                       quantity, unit_price, line_total)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+
+
+def _estimate_line_item_row(estimate_id: int, item_type: str, description: str,
+                            quantity: float = 1.0, unit_price: float = 0.0) -> tuple:
+    """Validate a line item and build its EstimateLineItems parameter tuple."""
     if item_type not in ('part', 'labor'):
         raise ValueError("item_type must be 'part' or 'labor'")
     
     line_total = round(quantity * unit_price, 2)
+    return (estimate_id, item_type, description, quantity, unit_price, line_total)
+
+
+def add_estimate_line_item(estimate_id: int, item_type: str, description: str,
+                          quantity: float = 1.0, unit_price: float = 0.0) -> int:
+    """Add line item to estimate. Returns line_item_id."""
+    row = _estimate_line_item_row(estimate_id, item_type, description, quantity, unit_price)
     
     conn = _get_connection()
     cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO EstimateLineItems (estimate_id, item_type, description, 
-                                       quantity, unit_price, line_total)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (estimate_id, item_type, description, quantity, unit_price, line_total))
-    conn.commit()
-    line_item_id = cur.lastrowid
-    conn.close()
+    cur.execute(_returning(_INSERT_ESTIMATE_LINE_ITEM_SQL, 'line_item_id'), row)
+    line_item_id = _inserted_id(cur)
     return int(line_item_id) if line_item_id else 0
 
 
+def add_estimate_line_items(estimate_id: int, items: List[Dict]) -> int:
+    """
+    Add several line items to an estimate in one transaction.
+    
+    Args:
+        estimate_id: Estimate ID
+        items: List of dicts with keys: 'item_type', 'description',
+               and optionally 'quantity' (default 1.0) and 'unit_price' (default 0.0)
+    
+    Returns:
+        Number of line items added
+    """
+    rows = [
+        _estimate_line_item_row(estimate_id, item['item_type'], item['description'],
+                                item.get('quantity', 1.0), item.get('unit_price', 0.0))
+        for item in items
+    ]
+    if not rows:
+        return 0
+    
+    with transaction() as conn:
+        conn.executemany(_INSERT_ESTIMATE_LINE_ITEM_SQL, rows)
+    return len(rows)
+
+
 def calculate_estimate_totals(estimate_id: int) -> Tuple[float, float, float]:
     """Calculate and update estimate totals. Returns (subtotal, tax, total)."""
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
     
-    # Get estimate
-    cur.execute("SELECT * FROM Estimates WHERE estimate_id = ?", (estimate_id,))
+    # Get estimate with its line item sum
+    cur.execute(f"""
+        SELECT e.customer_id, COALESCE(SUM(li.line_total), 0) as line_sum,
+               {_TAX_CUSTOMER_COLUMNS}
+        FROM Estimates e
+        LEFT JOIN Customers c ON c.customer_id = e.customer_id
+        LEFT JOIN EstimateLineItems li ON li.estimate_id = e.estimate_id
+        WHERE e.estimate_id = ?
+        GROUP BY e.estimate_id
+    """, (estimate_id,))
     estimate = cur.fetchone()
     if not estimate:
-        conn.close()
         raise ValueError(f"Estimate {estimate_id} not found")
     
-    # Get line items
-    cur.execute("""
-        SELECT * FROM EstimateLineItems 
-        WHERE estimate_id = ? 
-        ORDER BY line_item_id
-    """, (estimate_id,))
-    line_items = cur.fetchall()
-    
-    # Build line items for tax calculation
-    tax_line_items = [{'amount': item['line_total'], 'taxable': 1} for item in line_items]
-    
-    # Calculate tax
+    # Every estimate line is taxable, so the sum stands in for the individual lines
     subtotal, tax_amount, total = calculate_tax(
         estimate['customer_id'], 
-        tax_line_items,
+        [{'amount': estimate['line_sum'], 'taxable': 1}],
         payment_method=None,
-        new_engine_sale_price=0.0
+        new_engine_sale_price=0.0,
+        customer=_tax_customer(estimate)
     )
     
     # Update estimate
@@ -827,16 +1366,12 @@ def calculate_estimate_totals(estimate_id: int) -> Tuple[float, float, float]:
         WHERE estimate_id = ?
     """, (subtotal, tax_amount, total, estimate_id))
     
-    conn.commit()
-    conn.close()
-    
     return (subtotal, tax_amount, total)
 
 
 def get_estimate_details(estimate_id: int) -> Optional[Dict]:
     """Get estimate with all line items."""
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
     
     # Get estimate
@@ -848,10 +1383,9 @@ def get_estimate_details(estimate_id: int) -> Optional[Dict]:
         LEFT JOIN Boats b ON e.boat_id = b.boat_id
         WHERE e.estimate_id = ?
     """, (estimate_id,))
-    estimate = cur.fetchone()
+    estimate = _row_dict(cur.fetchone())
     
     if not estimate:
-        conn.close()
         return None
     
     # Get line items
@@ -860,81 +1394,241 @@ def get_estimate_details(estimate_id: int) -> Optional[Dict]:
         WHERE estimate_id = ? 
         ORDER BY line_item_id
     """, (estimate_id,))
-    estimate['line_items'] = cur.fetchall()
+    estimate['line_items'] = [dict(row) for row in cur.fetchall()]
     
-    conn.close()
     return estimate
 
 
-def list_estimates() -> List[Dict]:
-    """List all estimates."""
+def list_estimates(columns: Optional[Sequence[str]] = _ESTIMATE_LIST_COLUMNS) -> List[Dict]:
+    """List all estimates with customer name."""
+    select = _select_list('Estimates', _columns_key(columns), 'e.')
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
-    cur.execute("""
-        SELECT e.*, c.name as customer_name, e.date_created as estimate_date
+    cur.execute(f"""
+        SELECT {select}, c.name as customer_name, e.date_created as estimate_date
         FROM Estimates e
         LEFT JOIN Customers c ON e.customer_id = c.customer_id
         ORDER BY e.date_created DESC
     """)
-    results = cur.fetchall()
-    conn.close()
+    results = [dict(row) for row in cur.fetchall()]
     return results
 
 
+def list_estimates_full() -> List[Dict]:
+    """List all estimates with every column and customer name."""
+    return list_estimates(columns=None)
+
+
+# ============================================================================
+# LABOR RATE OPERATIONS
+# ============================================================================
+
+_LABOR_RATE_CLASSES = ('outboard', 'inboard', 'sterndrive', 'pwc')
+_DEFAULT_LABOR_RATES = (100.0, 120.0, 120.0, 120.0)
+
+# Customer labor rates by engine class, loaded on first use
+_labor_rates_cache: Optional[Dict[str, float]] = None
+_labor_rates_lock = threading.Lock()
+
+
+def get_labor_rates() -> Dict[str, float]:
+    """Get the customer labor rates by engine class (outboard, inboard, sterndrive, pwc)."""
+    global _labor_rates_cache
+    rates = _labor_rates_cache
+    if rates is None:
+        with _labor_rates_lock:
+            rates = _labor_rates_cache
+            if rates is None:
+                rates = _load_labor_rates()
+                _labor_rates_cache = rates
+    return dict(rates)
+
+
+def _load_labor_rates() -> Dict[str, float]:
+    """Read the LaborRates row, creating the table and default row if missing."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS LaborRates (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            outboard REAL NOT NULL,
+            inboard REAL NOT NULL,
+            sterndrive REAL NOT NULL,
+            pwc REAL NOT NULL
+        )
+    """)
+    cur.execute("SELECT outboard, inboard, sterndrive, pwc FROM LaborRates WHERE id = 1")
+    row = cur.fetchone()
+    if not row:
+        cur.execute("INSERT INTO LaborRates (id, outboard, inboard, sterndrive, pwc) VALUES (1, ?, ?, ?, ?)",
+                    _DEFAULT_LABOR_RATES)
+        row = _DEFAULT_LABOR_RATES
+    return {cls: float(rate) for cls, rate in zip(_LABOR_RATE_CLASSES, row)}
+
+
+def set_labor_rates(outboard: float, inboard: float, sterndrive: float, pwc: float) -> None:
+    """Save the customer labor rates by engine class."""
+    get_labor_rates()  # makes sure the row exists
+    conn = _get_connection()
+    conn.execute("UPDATE LaborRates SET outboard = ?, inboard = ?, sterndrive = ?, pwc = ? WHERE id = 1",
+                 (outboard, inboard, sterndrive, pwc))
+    invalidate_labor_rates_cache()
+
+
+def invalidate_labor_rates_cache() -> None:
+    """Drop the cached labor rates so the next lookup re-reads LaborRates."""
+    global _labor_rates_cache
+    with _labor_rates_lock:
+        _labor_rates_cache = None
+
+
+# ============================================================================
+# MECHANIC OPERATIONS
+# ============================================================================
+
+# Mechanic list and hourly rates by mechanic_id, loaded on first use and
+# dropped by the mechanic write helpers
+_mechanics_cache: Optional[Tuple[List[Dict], Dict[int, Optional[float]]]] = None
+_mechanics_lock = threading.Lock()
+
+
+def _cached_mechanics() -> Tuple[List[Dict], Dict[int, Optional[float]]]:
+    """Return the cached (mechanics ordered by name, hourly rate by mechanic_id)."""
+    global _mechanics_cache
+    cached = _mechanics_cache
+    if cached is None:
+        with _mechanics_lock:
+            cached = _mechanics_cache
+            if cached is None:
+                conn = _get_connection()
+                cur = conn.cursor()
+                cur.execute("SELECT mechanic_id, name, hourly_rate, phone, email FROM Mechanics ORDER BY name")
+                mechanics = [dict(row) for row in cur.fetchall()]
+                cached = (mechanics, {m['mechanic_id']: m['hourly_rate'] for m in mechanics})
+                _mechanics_cache = cached
+    return cached
+
+
+def list_mechanics() -> List[Dict]:
+    """List all mechanics ordered by name."""
+    return [dict(m) for m in _cached_mechanics()[0]]
+
+
+def invalidate_mechanics_cache() -> None:
+    """Drop the cached mechanic list so the next lookup re-reads Mechanics."""
+    global _mechanics_cache
+    with _mechanics_lock:
+        _mechanics_cache = None
+
+
+def get_mechanic(mechanic_id: int) -> Optional[Dict]:
+    """Get mechanic by ID. Returns dict or None."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT mechanic_id, name, hourly_rate, phone, email FROM Mechanics WHERE mechanic_id = ?",
+                (mechanic_id,))
+    result = _row_dict(cur.fetchone())
+    return result
+
+
+_INSERT_MECHANIC_SQL = _returning("""
+    INSERT INTO Mechanics (name, hourly_rate, phone, email)
+    VALUES (?, ?, ?, ?)
+""", 'mechanic_id')
+
+
+def create_mechanic(name: str, hourly_rate: float, phone: Optional[str] = None,
+                    email: Optional[str] = None) -> int:
+    """Create a new mechanic. Returns mechanic_id."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.execute(_INSERT_MECHANIC_SQL, (name, hourly_rate, phone, email))
+    mechanic_id = _inserted_id(cur)
+    invalidate_mechanics_cache()
+    return int(mechanic_id) if mechanic_id else 0
+
+
+def update_mechanic(mechanic_id: int, **fields) -> bool:
+    """Update mechanic fields. Returns success boolean."""
+    success = _update_row('Mechanics', 'mechanic_id', mechanic_id, fields)
+    if success:
+        invalidate_mechanics_cache()
+    return success
+
+
+_DELETE_MECHANIC_SQL = _returning("DELETE FROM Mechanics WHERE mechanic_id = ?", '1')
+
+
+def delete_mechanic(mechanic_id: int) -> bool:
+    """Delete a mechanic. Returns success boolean."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.execute(_DELETE_MECHANIC_SQL, (mechanic_id,))
+    success = _affected(cur)
+    if success:
+        invalidate_mechanics_cache()
+    return success
+
+
 # ============================================================================
 # TICKET OPERATIONS
 # ============================================================================
 
+_TICKET_STATUSES = ['Open', 'Working', 'Awaiting Parts', 'Awaiting Customer',
+                    'Awaiting Payment', 'Awaiting Pickup', 'Closed']
+_VALID_STATUSES = frozenset(_TICKET_STATUSES)
+_VALID_STATUSES_MSG = f"Invalid status. Must be one of: {_TICKET_STATUSES}"
+
+# Built once so each connection's statement cache sees the same SQL text
+_INSERT_TICKET_SQL = _returning("""
+    INSERT INTO Tickets (customer_id, boat_id, engine_id, description, customer_notes,
+                       date_opened, status)
+    VALUES (?, ?, ?, ?, NULL, ?, 'Open')
+""", 'ticket_id')
+# date_closed is only stamped when the new status is Closed
+_UPDATE_TICKET_STATUS_SQL = _returning("""
+    UPDATE Tickets 
+    SET status = ?1,
+        date_closed = CASE WHEN ?1 = 'Closed' THEN ?2 ELSE date_closed END
+    WHERE ticket_id = ?3
+""", '1')
+
+
 def create_ticket(customer_id: int, boat_id: int, engine_id: Optional[int] = None,
                  description: Optional[str] = None) -> int:
     """Create a new ticket. Returns ticket_id."""
-    date_opened = datetime.now().strftime('%Y-%m-%d')
+    date_opened = _today_iso()
     
     conn = _get_connection()
     cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO Tickets (customer_id, boat_id, engine_id, description, customer_notes,
-                           date_opened, status)
-        VALUES (?, ?, ?, ?, NULL, ?, 'Open')
-    """, (customer_id, boat_id, engine_id, description, date_opened))
-    conn.commit()
-    ticket_id = cur.lastrowid
-    conn.close()
+    cur.execute(_INSERT_TICKET_SQL, (customer_id, boat_id, engine_id, description, date_opened))
+    ticket_id = _inserted_id(cur)
     return int(ticket_id) if ticket_id else 0
 
 
 def update_ticket_status(ticket_id: int, new_status: str) -> bool:
     """Update ticket status. Returns success boolean."""
-    valid_statuses = ['Open', 'Working', 'Awaiting Parts', 'Awaiting Customer', 
-                     'Awaiting Payment', 'Awaiting Pickup', 'Closed']
-    if new_status not in valid_statuses:
-        raise ValueError(f"Invalid status. Must be one of: {valid_statuses}")
+    if new_status not in _VALID_STATUSES:
+        raise ValueError(_VALID_STATUSES_MSG)
     
     conn = _get_connection()
     cur = conn.cursor()
-    
-    # If closing ticket, set date_closed
-    if new_status == 'Closed':
-        date_closed = datetime.now().strftime('%Y-%m-%d')
-        cur.execute("""
-            UPDATE Tickets 
-            SET status = ?, date_closed = ?
-            WHERE ticket_id = ?
-        """, (new_status, date_closed, ticket_id))
-    else:
-        cur.execute("""
-            UPDATE Tickets 
-            SET status = ?
-            WHERE ticket_id = ?
-        """, (new_status, ticket_id))
-    
-    conn.commit()
-    success = cur.rowcount > 0
-    conn.close()
+    cur.execute(_UPDATE_TICKET_STATUS_SQL, (new_status, _today_iso(), ticket_id))
+    success = _affected(cur)
     return success
 
 
+_INSERT_TICKET_PART_SQL = """
+    INSERT INTO TicketParts (ticket_id, part_id, quantity_used)
+    VALUES (?, ?, ?)
+"""
+_INSERT_TICKET_PART_RETURNING_SQL = _returning(_INSERT_TICKET_PART_SQL, 'ticket_part_id')
+_INSERT_TICKET_PART_PRICE_SQL = _returning("""
+    INSERT INTO TicketParts (ticket_id, part_id, quantity_used, price)
+    VALUES (?, ?, ?, ?)
+""", 'ticket_part_id')
+
+
 def add_ticket_part(ticket_id: int, part_id: int, quantity: int, price_override: Optional[float] = None) -> int:
     """Add part to ticket with optional price override. Returns ticket_part_id."""
     conn = _get_connection()
@@ -942,109 +1636,169 @@ def add_ticket_part(ticket_id: int, part_id: int, quantity: int, price_override:
     
     if price_override is not None:
         # Use override price
-        cur.execute("""
-            INSERT INTO TicketParts (ticket_id, part_id, quantity_used, price)
-            VALUES (?, ?, ?, ?)
-        """, (ticket_id, part_id, quantity, price_override))
+        cur.execute(_INSERT_TICKET_PART_PRICE_SQL, (ticket_id, part_id, quantity, price_override))
     else:
         # Use default part price
-        cur.execute("""
-            INSERT INTO TicketParts (ticket_id, part_id, quantity_used)
-            VALUES (?, ?, ?)
-        """, (ticket_id, part_id, quantity))
+        cur.execute(_INSERT_TICKET_PART_RETURNING_SQL, (ticket_id, part_id, quantity))
     
-    conn.commit()
-    ticket_part_id = cur.lastrowid
-    conn.close()
+    ticket_part_id = _inserted_id(cur)
     return int(ticket_part_id) if ticket_part_id else 0
 
 
+def add_ticket_parts(ticket_id: int, items: List[Tuple[int, int]]) -> int:
+    """Add several (part_id, quantity) pairs to a ticket in one transaction. Returns count added."""
+    rows = [(ticket_id, part_id, quantity) for part_id, quantity in items]
+    if not rows:
+        return 0
+    
+    with transaction() as conn:
+        conn.executemany(_INSERT_TICKET_PART_SQL, rows)
+    return len(rows)
+
+
+_DELETE_TICKET_PART_SQL = _returning("DELETE FROM TicketParts WHERE ticket_part_id = ?", '1')
+
+
 def delete_ticket_part(ticket_part_id: int) -> bool:
     """Delete a part from a ticket. Returns success boolean."""
     conn = _get_connection()
     cur = conn.cursor()
-    cur.execute("DELETE FROM TicketParts WHERE ticket_part_id = ?", (ticket_part_id,))
-    conn.commit()
-    success = cur.rowcount > 0
-    conn.close()
+    cur.execute(_DELETE_TICKET_PART_SQL, (ticket_part_id,))
+    success = _affected(cur)
     return success
 
 
+# (substring of Engines.engine_type, labor rate class), checked in order
+_ENGINE_CLASS_MAP = (
+    ('outboard', 'outboard'),
+    ('inboard', 'inboard'),
+    ('stern', 'sterndrive'),
+    ('pwc', 'pwc'),
+    ('jetski', 'pwc'),
+)
+
+
+def engine_labor_class(engine_type: Optional[str]) -> Optional[str]:
+    """Map an engine type label to its labor rate class (outboard, inboard, sterndrive, pwc), or None."""
+    if not engine_type:
+        return None
+    eng_type = engine_type.strip().lower()
+    return next((cls for sub, cls in _ENGINE_CLASS_MAP if sub in eng_type), None)
+
+
+def _ticket_customer_rate(cur, ticket_id: int) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Get (engine_class_rate, fallback_rate) for labor on a ticket.
+    
+    engine_class_rate is the LaborRates rate for the ticket's engine class, or
+    None when the class is unknown. In that case the mechanic's own hourly rate
+    applies, and fallback_rate (the outboard rate) covers a missing hourly rate.
+    """
+    # Determine engine class for this ticket
+    cur.execute("""
+        SELECT e.engine_type
+        FROM Tickets t
+        LEFT JOIN Engines e ON e.engine_id = t.engine_id
+        WHERE t.ticket_id = ?
+    """, (ticket_id,))
+    er = cur.fetchone()
+    engine_class = engine_labor_class(er[0] if er else None)
+    rates = get_labor_rates()
+    if engine_class and engine_class in rates:
+        return rates[engine_class], None
+    # Fallback: mechanic's own hourly rate (resolved in the INSERT); else default outboard rate
+    return None, rates['outboard']
+
+
+def get_customer_labor_rate(ticket_id: int, mechanic_id: Optional[int] = None) -> float:
+    """Get the rate add_ticket_labor would charge for this ticket and mechanic when no rate is given."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    labor_rate, fallback_rate = _ticket_customer_rate(cur, ticket_id)
+    if labor_rate is not None:
+        return labor_rate
+    if mechanic_id is not None:
+        rates = _cached_mechanics()[1]
+        if mechanic_id in rates:
+            hourly_rate = rates[mechanic_id]
+        else:
+            # Not one the cache has seen (added outside this module); ask the table
+            cur.execute("SELECT hourly_rate FROM Mechanics WHERE mechanic_id = ?", (mechanic_id,))
+            mr = cur.fetchone()
+            hourly_rate = mr[0] if mr else None
+        if hourly_rate is not None:
+            return float(hourly_rate)
+    return fallback_rate
+
+
+_INSERT_TICKET_LABOR_SQL = """
+    INSERT INTO TicketAssignments (ticket_id, mechanic_id, hours_worked, 
+                                   work_description, labor_rate)
+    VALUES (?, ?, ?, ?, COALESCE(?, (SELECT hourly_rate FROM Mechanics WHERE mechanic_id = ?), ?))
+"""
+_INSERT_TICKET_LABOR_RETURNING_SQL = _returning(_INSERT_TICKET_LABOR_SQL, 'assignment_id')
+
+
 def add_ticket_labor(ticket_id: int, mechanic_id: int, hours: float,
                     work_description: Optional[str] = None, labor_rate: Optional[float] = None) -> int:
     """Add labor to ticket. Returns assignment_id."""
     conn = _get_connection()
     cur = conn.cursor()
     
+    # Used only when neither an engine-class rate nor the mechanic's own rate applies
+    fallback_rate = None
+    
     # If no labor rate provided, determine customer rate based on engine class and LaborRates table
     if labor_rate is None:
-        # Determine engine class for this ticket
-        cur.execute("SELECT engine_id FROM Tickets WHERE ticket_id = ?", (ticket_id,))
-        tr = cur.fetchone()
-        engine_class = None
-        if tr and tr[0]:
-            cur.execute("SELECT engine_type FROM Engines WHERE engine_id = ?", (tr[0],))
-            er = cur.fetchone()
-            eng_type = (er[0].strip().lower() if er and er[0] else '').lower()
-            # Normalize common labels
-            if 'outboard' in eng_type:
-                engine_class = 'outboard'
-            elif 'inboard' in eng_type:
-                engine_class = 'inboard'
-            elif 'stern' in eng_type or 'sterndrive' in eng_type:
-                engine_class = 'sterndrive'
-            elif 'pwc' in eng_type or 'jetski' in eng_type:
-                engine_class = 'pwc'
-        # Fetch current labor rates (create defaults if missing)
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS LaborRates (
-                id INTEGER PRIMARY KEY CHECK (id = 1),
-                outboard REAL NOT NULL,
-                inboard REAL NOT NULL,
-                sterndrive REAL NOT NULL,
-                pwc REAL NOT NULL
-            )
-        """)
-        conn.commit()
-        cur.execute("SELECT outboard, inboard, sterndrive, pwc FROM LaborRates WHERE id = 1")
-        row = cur.fetchone()
-        if not row:
-            cur.execute("INSERT INTO LaborRates (id, outboard, inboard, sterndrive, pwc) VALUES (1, 100.0, 120.0, 120.0, 120.0)")
-            conn.commit()
-            row = (100.0, 120.0, 120.0, 120.0)
-        rates = {
-            'outboard': float(row[0]),
-            'inboard': float(row[1]),
-            'sterndrive': float(row[2]),
-            'pwc': float(row[3])
-        }
-        if engine_class and engine_class in rates:
-            labor_rate = rates[engine_class]
-        else:
-            # Fallback: use mechanic's own hourly rate if available; else default outboard rate
-            cur.execute("SELECT hourly_rate FROM Mechanics WHERE mechanic_id = ?", (mechanic_id,))
-            mr = cur.fetchone()
-            labor_rate = float(mr[0]) if mr and mr[0] is not None else rates['outboard']
+        labor_rate, fallback_rate = _ticket_customer_rate(cur, ticket_id)
     
-    cur.execute("""
-        INSERT INTO TicketAssignments (ticket_id, mechanic_id, hours_worked, 
-                                       work_description, labor_rate)
-        VALUES (?, ?, ?, ?, ?)
-    """, (ticket_id, mechanic_id, hours, work_description, labor_rate))
-    conn.commit()
-    assignment_id = cur.lastrowid
-    conn.close()
+    cur.execute(_INSERT_TICKET_LABOR_RETURNING_SQL,
+                (ticket_id, mechanic_id, hours, work_description, labor_rate,
+                 mechanic_id, fallback_rate))
+    assignment_id = _inserted_id(cur)
     return int(assignment_id) if assignment_id else 0
 
 
+def add_ticket_labor_batch(ticket_id: int, entries: List[Dict]) -> int:
+    """
+    Add several labor entries to a ticket in one transaction.
+    
+    Args:
+        ticket_id: Ticket ID
+        entries: List of dicts with keys: 'mechanic_id', 'hours', and optionally
+                 'work_description' and 'labor_rate' (customer rate looked up when omitted)
+    
+    Returns:
+        Number of labor entries added
+    """
+    if not entries:
+        return 0
+    
+    with transaction() as conn:
+        cur = conn.cursor()
+        default_rate = fallback_rate = None
+        if any(entry.get('labor_rate') is None for entry in entries):
+            # Same rate for every entry on the ticket, so look it up once
+            default_rate, fallback_rate = _ticket_customer_rate(cur, ticket_id)
+        rows = []
+        for entry in entries:
+            labor_rate = entry.get('labor_rate')
+            rows.append((ticket_id, entry['mechanic_id'], entry['hours'], entry.get('work_description'),
+                         default_rate if labor_rate is None else labor_rate,
+                         entry['mechanic_id'], None if labor_rate is not None else fallback_rate))
+        cur.executemany(_INSERT_TICKET_LABOR_SQL, rows)
+    return len(rows)
+
+
+_DELETE_TICKET_LABOR_SQL = _returning("DELETE FROM TicketAssignments WHERE assignment_id = ?", '1')
+
+
 def delete_ticket_labor(assignment_id: int) -> bool:
     """Delete a labor entry from a ticket. Returns success boolean."""
     conn = _get_connection()
     cur = conn.cursor()
-    cur.execute("DELETE FROM TicketAssignments WHERE assignment_id = ?", (assignment_id,))
-    conn.commit()
-    success = cur.rowcount > 0
-    conn.close()
+    cur.execute(_DELETE_TICKET_LABOR_SQL, (assignment_id,))
+    success = _affected(cur)
     return success
 
 
@@ -1052,49 +1806,31 @@ def calculate_ticket_totals(ticket_id: int, payment_method: Optional[str] = None
                            new_engine_id: Optional[int] = None) -> Tuple[float, float, float]:
     """Calculate and update ticket totals. Returns (subtotal, tax, total)."""
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
     
-    # Get ticket
-    cur.execute("SELECT * FROM Tickets WHERE ticket_id = ?", (ticket_id,))
+    # Get ticket and the customer fields used for tax
+    cur.execute(f"""
+        SELECT t.customer_id, {_TAX_CUSTOMER_COLUMNS}
+        FROM Tickets t
+        LEFT JOIN Customers c ON c.customer_id = t.customer_id
+        WHERE t.ticket_id = ?
+    """, (ticket_id,))
     ticket = cur.fetchone()
     if not ticket:
-        conn.close()
         raise ValueError(f"Ticket {ticket_id} not found")
     
-    # Get parts
+    # Parts and labor (always taxable) as tax line items, multiplied out exactly by calculate_tax
     cur.execute("""
-        SELECT tp.quantity_used, p.price, p.taxable
+        SELECT tp.quantity_used as quantity, p.price as price, p.taxable as taxable
         FROM TicketParts tp
         JOIN Parts p ON tp.part_id = p.part_id
         WHERE tp.ticket_id = ?
-    """, (ticket_id,))
-    parts = cur.fetchall()
-    
-    # Get labor
-    cur.execute("""
-        SELECT hours_worked, labor_rate
+        UNION ALL
+        SELECT hours_worked, labor_rate, 1
         FROM TicketAssignments
         WHERE ticket_id = ?
-    """, (ticket_id,))
-    labor = cur.fetchall()
-    
-    # Build line items
-    line_items = []
-    
-    # Add parts
-    for part in parts:
-        line_items.append({
-            'amount': part['quantity_used'] * part['price'],
-            'taxable': part['taxable']
-        })
-    
-    # Add labor (always taxable)
-    for l in labor:
-        line_items.append({
-            'amount': l['hours_worked'] * l['labor_rate'],
-            'taxable': 1
-        })
+    """, (ticket_id, ticket_id))
+    line_items = list(map(dict, cur.fetchall()))
     
     # Check for new engine sale
     new_engine_sale_price = 0.0
@@ -1109,7 +1845,8 @@ def calculate_ticket_totals(ticket_id: int, payment_method: Optional[str] = None
         ticket['customer_id'],
         line_items,
         payment_method=payment_method,
-        new_engine_sale_price=new_engine_sale_price
+        new_engine_sale_price=new_engine_sale_price,
+        customer=_tax_customer(ticket)
     )
     
     # Update ticket
@@ -1119,97 +1856,219 @@ def calculate_ticket_totals(ticket_id: int, payment_method: Optional[str] = None
         WHERE ticket_id = ?
     """, (subtotal, tax_amount, total, payment_method, ticket_id))
     
-    conn.commit()
-    conn.close()
-    
     return (subtotal, tax_amount, total)
 
 
+def _recalculate_tickets(sql: str, params: tuple) -> int:
+    """Recalculate stored totals for the ticket ids sql selects, in one transaction."""
+    with transaction() as conn:
+        ticket_ids = [row[0] for row in conn.execute(sql, params).fetchall()]
+        for ticket_id in ticket_ids:
+            calculate_ticket_totals(ticket_id)
+    return len(ticket_ids)
+
+
+def recalculate_customer_tickets(customer_id: int) -> int:
+    """Recalculate stored totals for a customer's tickets (their tax status may have changed).
+    
+    Returns the number of tickets updated.
+    """
+    return _recalculate_tickets("SELECT ticket_id FROM Tickets WHERE customer_id = ?", (customer_id,))
+
+
+def recalculate_part_tickets(part_id: int) -> int:
+    """Recalculate stored totals for tickets that use a part (its price or taxable flag may have changed).
+    
+    Returns the number of tickets updated.
+    """
+    return _recalculate_tickets("SELECT DISTINCT ticket_id FROM TicketParts WHERE part_id = ?", (part_id,))
+
+
+# (key, SQL expression) for each enriched part/labor entry of get_ticket_details;
+# quantity and line_total/labor_total are the computed fields the PDF generator expects
+_TICKET_PART_COLUMNS = (
+    ('ticket_part_id', 'tp.ticket_part_id'),
+    ('part_id', 'tp.part_id'),
+    ('part_name', 'p.name'),
+    ('part_number', 'p.part_number'),
+    ('price', 'p.price'),
+    ('quantity_used', 'tp.quantity_used'),
+    ('quantity', 'tp.quantity_used'),
+    ('line_total', 'CASE WHEN tp.quantity_used AND p.price IS NOT NULL '
+                   'THEN tp.quantity_used * p.price ELSE 0.0 END'),
+    ('taxable', 'p.taxable'),
+)
+_TICKET_LABOR_COLUMNS = (
+    ('assignment_id', 'ta.assignment_id'),
+    ('mechanic_id', 'ta.mechanic_id'),
+    ('mechanic_name', 'm.name'),
+    ('work_description', 'ta.work_description'),
+    ('work_summary', "substr(COALESCE(ta.work_description, ''), 1, 40)"),
+    ('hours_worked', 'ta.hours_worked'),
+    ('labor_rate', 'ta.labor_rate'),
+    ('labor_total', 'CASE WHEN ta.hours_worked AND ta.labor_rate IS NOT NULL '
+                    'THEN ta.hours_worked * ta.labor_rate ELSE 0.0 END'),
+)
+_TICKET_PARTS_FROM = """
+    FROM TicketParts tp
+    JOIN Parts p ON tp.part_id = p.part_id
+    WHERE tp.ticket_id {match}
+"""
+_TICKET_LABOR_FROM = """
+    FROM TicketAssignments ta
+    JOIN Mechanics m ON ta.mechanic_id = m.mechanic_id
+    WHERE ta.ticket_id {match}
+"""
+
+
+def _aliased_columns(columns: Tuple[Tuple[str, str], ...]) -> str:
+    """Render (key, expr) pairs as a SELECT list."""
+    return ', '.join(f"{expr} as {key}" for key, expr in columns)
+
+
+def _json_object(columns: Tuple[Tuple[str, str], ...]) -> str:
+    """Render (key, expr) pairs as a json_object() call."""
+    return 'json_object(' + ', '.join(f"'{key}', {expr}" for key, expr in columns) + ')'
+
+
+def _has_json() -> bool:
+    """Check whether this SQLite build has the JSON1 functions."""
+    conn = sqlite3.connect(':memory:')
+    try:
+        conn.execute("SELECT json_group_array(json_object('a', 1))")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+# The JSON1 functions are built in from SQLite 3.38 and usually compiled in before that
+_HAS_JSON = _has_json()
+
+_TICKET_SELECT = """
+    SELECT t.*, c.name as customer_name, c.phone as customer_phone,
+           b.make as boat_make, b.model as boat_model,
+           e.make as engine_make, e.model as engine_model, e.hp as engine_hp,
+           e.engine_type as engine_type, e.year as engine_year, e.outdrive as engine_outdrive
+           {json_columns}
+    FROM Tickets t
+    LEFT JOIN Customers c ON t.customer_id = c.customer_id
+    LEFT JOIN Boats b ON t.boat_id = b.boat_id
+    LEFT JOIN Engines e ON t.engine_id = e.engine_id
+"""
+_TICKET_PLAIN_SELECT = _TICKET_SELECT.format(json_columns='')
+if _HAS_JSON:
+    # Parts and labor come back as JSON arrays on the ticket row
+    _TICKET_JSON_SELECT = _TICKET_SELECT.format(json_columns=f"""
+           , (SELECT json_group_array({_json_object(_TICKET_PART_COLUMNS)})
+              {_TICKET_PARTS_FROM.format(match='= t.ticket_id')}) as parts_json
+           , (SELECT json_group_array({_json_object(_TICKET_LABOR_COLUMNS)})
+              {_TICKET_LABOR_FROM.format(match='= t.ticket_id')}) as labor_json""")
+else:
+    _TICKET_JSON_SELECT = _TICKET_PLAIN_SELECT
+_TICKET_DETAILS_SQL = _TICKET_JSON_SELECT + "WHERE t.ticket_id = ?"
+_TICKET_PARTS_SQL = f"SELECT {_aliased_columns(_TICKET_PART_COLUMNS)} {_TICKET_PARTS_FROM.format(match='= ?')}"
+_TICKET_LABOR_SQL = f"SELECT {_aliased_columns(_TICKET_LABOR_COLUMNS)} {_TICKET_LABOR_FROM.format(match='= ?')}"
+
+# Stay well under SQLite's bound-parameter limit (999 before 3.32) in IN (...) lists
+_MAX_IN_PARAMS = 900
+
+
 def get_ticket_details(ticket_id: int) -> Optional[Dict]:
     """Get ticket with all details (parts, labor, customer, boat, engine)."""
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
     
-    # Get ticket
-    cur.execute("""
-        SELECT t.*, c.name as customer_name, c.phone as customer_phone,
-               b.make as boat_make, b.model as boat_model,
-               e.make as engine_make, e.model as engine_model, e.hp as engine_hp,
-               e.engine_type as engine_type, e.year as engine_year, e.outdrive as engine_outdrive
-        FROM Tickets t
-        LEFT JOIN Customers c ON t.customer_id = c.customer_id
-        LEFT JOIN Boats b ON t.boat_id = b.boat_id
-        LEFT JOIN Engines e ON t.engine_id = e.engine_id
-        WHERE t.ticket_id = ?
-    """, (ticket_id,))
-    ticket = cur.fetchone()
+    cur.execute(_TICKET_DETAILS_SQL, (ticket_id,))
+    ticket = _row_dict(cur.fetchone())
     
     if not ticket:
-        conn.close()
         return None
     
-    # Get parts and enrich with computed fields expected by PDF generator
-    cur.execute("""
-        SELECT tp.ticket_part_id, tp.part_id, tp.quantity_used,
-               p.part_number, p.name as part_name, p.price, p.taxable
-        FROM TicketParts tp
-        JOIN Parts p ON tp.part_id = p.part_id
-        WHERE tp.ticket_id = ?
-    """, (ticket_id,))
-    raw_parts = cur.fetchall()
-    parts_enriched = []
-    for rp in raw_parts:
-        line_total = (rp['quantity_used'] * rp['price']) if rp.get('quantity_used') and rp.get('price') is not None else 0.0
-        parts_enriched.append({
-            'ticket_part_id': rp['ticket_part_id'],
-            'part_id': rp['part_id'],
-            'part_name': rp['part_name'],
-            'part_number': rp.get('part_number'),
-            'price': rp['price'],
-            'quantity_used': rp['quantity_used'],
-            'quantity': rp['quantity_used'],  # alias for PDF code
-            'line_total': line_total,
-            'taxable': rp.get('taxable', 1)
-        })
-    ticket['parts'] = parts_enriched
-    
-    # Get labor and enrich
-    cur.execute("""
-        SELECT ta.assignment_id, ta.mechanic_id, ta.hours_worked, ta.work_description, ta.labor_rate,
-               m.name as mechanic_name
-        FROM TicketAssignments ta
-        JOIN Mechanics m ON ta.mechanic_id = m.mechanic_id
-        WHERE ta.ticket_id = ?
-    """, (ticket_id,))
-    raw_labor = cur.fetchall()
-    labor_enriched = []
-    for rl in raw_labor:
-        labor_total = (rl['hours_worked'] * rl['labor_rate']) if rl.get('hours_worked') and rl.get('labor_rate') is not None else 0.0
-        labor_enriched.append({
-            'assignment_id': rl['assignment_id'],
-            'mechanic_id': rl['mechanic_id'],
-            'mechanic_name': rl['mechanic_name'],
-            'work_description': rl.get('work_description', ''),
-            'hours_worked': rl['hours_worked'],
-            'labor_rate': rl['labor_rate'],
-            'labor_total': labor_total
-        })
-    ticket['labor'] = labor_enriched
-    
-    conn.close()
+    if _HAS_JSON:
+        ticket['parts'] = json.loads(ticket.pop('parts_json') or '[]')
+        ticket['labor'] = json.loads(ticket.pop('labor_json') or '[]')
+        return ticket
+    
+    cur.execute(_TICKET_PARTS_SQL, (ticket_id,))
+    ticket['parts'] = [dict(row) for row in cur.fetchall()]
+    cur.execute(_TICKET_LABOR_SQL, (ticket_id,))
+    ticket['labor'] = [dict(row) for row in cur.fetchall()]
+    
     return ticket
 
+
+def get_ticket_details_bulk(ticket_ids: List[int]) -> Dict[int, Dict]:
+    """
+    Get details for many tickets at once, keyed by ticket_id.
+    
+    Same shape as get_ticket_details; ids that do not exist are left out.
+    Runs a fixed number of queries per batch of ids instead of one
+    get_ticket_details call per ticket.
+    """
+    ids = list(dict.fromkeys(ticket_ids))
+    conn = _get_connection()
+    cur = conn.cursor()
+    tickets: Dict[int, Dict] = {}
+    
+    for start in range(0, len(ids), _MAX_IN_PARAMS):
+        batch = ids[start:start + _MAX_IN_PARAMS]
+        match = f"IN ({','.join('?' * len(batch))})"
+        
+        if _HAS_JSON:
+            cur.execute(f"{_TICKET_JSON_SELECT}WHERE t.ticket_id {match}", batch)
+            for row in cur.fetchall():
+                ticket = dict(row)
+                ticket['parts'] = json.loads(ticket.pop('parts_json') or '[]')
+                ticket['labor'] = json.loads(ticket.pop('labor_json') or '[]')
+                tickets[ticket['ticket_id']] = ticket
+            continue
+        
+        cur.execute(f"{_TICKET_PLAIN_SELECT}WHERE t.ticket_id {match}", batch)
+        batch_tickets = {}
+        for row in cur.fetchall():
+            ticket = dict(row)
+            ticket['parts'] = []
+            ticket['labor'] = []
+            batch_tickets[ticket['ticket_id']] = ticket
+        
+        cur.execute(f"SELECT tp.ticket_id as ticket_id, {_aliased_columns(_TICKET_PART_COLUMNS)} "
+                    f"{_TICKET_PARTS_FROM.format(match=match)}", batch)
+        for row in cur.fetchall():
+            part = dict(row)
+            batch_tickets[part.pop('ticket_id')]['parts'].append(part)
+        
+        cur.execute(f"SELECT ta.ticket_id as ticket_id, {_aliased_columns(_TICKET_LABOR_COLUMNS)} "
+                    f"{_TICKET_LABOR_FROM.format(match=match)}", batch)
+        for row in cur.fetchall():
+            labor = dict(row)
+            batch_tickets[labor.pop('ticket_id')]['labor'].append(labor)
+        
+        tickets.update(batch_tickets)
+    
+    return tickets
+
+# db.init.SCHEMA_VERSION that guarantees Tickets.customer_notes
+_NOTES_SCHEMA_VERSION = 1
+# Connection generation the notes column was last checked for (-1 = not yet)
+_notes_column_generation = -1
+
+
 def _ensure_ticket_notes_column():
-    """Ensure the Tickets table has customer_notes column."""
+    """Ensure the Tickets table has customer_notes column (checked once per connection generation)."""
+    global _notes_column_generation
+    if _notes_column_generation == _connection_generation:
+        return
     conn = _get_connection()
     cur = conn.cursor()
-    cur.execute('PRAGMA table_info(Tickets)')
-    cols = [row[1] for row in cur.fetchall()]
-    if 'customer_notes' not in cols:
-        cur.execute('ALTER TABLE Tickets ADD COLUMN customer_notes TEXT')
-        conn.commit()
-    conn.close()
+    cur.execute('PRAGMA user_version')
+    if cur.fetchone()[0] < _NOTES_SCHEMA_VERSION:
+        cur.execute('PRAGMA table_info(Tickets)')
+        cols = [row[1] for row in cur.fetchall()]
+        if 'customer_notes' not in cols:
+            cur.execute('ALTER TABLE Tickets ADD COLUMN customer_notes TEXT')
+    _notes_column_generation = _connection_generation
 
 def set_ticket_notes(ticket_id: int, notes: str) -> None:
     """Set or update the Notes (Tickets.description) for a ticket."""
@@ -1217,104 +2076,237 @@ def set_ticket_notes(ticket_id: int, notes: str) -> None:
     conn = _get_connection()
     cur = conn.cursor()
     cur.execute("UPDATE Tickets SET customer_notes = ? WHERE ticket_id = ?", (notes, ticket_id))
-    conn.commit()
-    conn.close()
 
 
-def list_tickets(status: Optional[str] = None) -> List[Dict]:
-    """List tickets, optionally filtered by status."""
+# New text goes on its own line; surrounding whitespace is trimmed like str.strip()
+_APPEND_TICKET_NOTES_SQL = _returning("""
+    UPDATE Tickets
+    SET customer_notes = TRIM(COALESCE(NULLIF(customer_notes, '') || char(10), '') || ?,
+                              ' ' || char(9) || char(10) || char(13))
+    WHERE ticket_id = ?
+""", 'customer_notes')
+
+
+def append_ticket_notes(ticket_id: int, notes: str) -> Optional[str]:
+    """Append a line to a ticket's customer notes. Returns the combined notes, or None if no such ticket."""
+    _ensure_ticket_notes_column()
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
-    
-    if status:
-        cur.execute("""
-            SELECT t.*, c.name as customer_name, b.make as boat_make, b.model as boat_model
-            FROM Tickets t
-            LEFT JOIN Customers c ON t.customer_id = c.customer_id
-            LEFT JOIN Boats b ON t.boat_id = b.boat_id
-            WHERE t.status = ?
-            ORDER BY t.date_opened DESC
-        """, (status,))
+    cur.execute(_APPEND_TICKET_NOTES_SQL, (notes, ticket_id))
+    if _HAS_RETURNING:
+        row = cur.fetchone()
+    elif cur.rowcount > 0:
+        row = cur.execute("SELECT customer_notes FROM Tickets WHERE ticket_id = ?", (ticket_id,)).fetchone()
     else:
-        cur.execute("""
-            SELECT t.*, c.name as customer_name, b.make as boat_make, b.model as boat_model
-            FROM Tickets t
-            LEFT JOIN Customers c ON t.customer_id = c.customer_id
-            LEFT JOIN Boats b ON t.boat_id = b.boat_id
-            ORDER BY t.date_opened DESC
-        """)
+        row = None
+    return row[0] if row is not None else None
+
+
+# Everything but customer_notes, which the list never shows (get_ticket_details has it)
+_LIST_TICKETS_SQL = """
+    SELECT t.ticket_id, t.customer_id, t.boat_id, t.engine_id, t.description, t.status,
+           t.date_opened, t.date_closed, t.payment_method, t.subtotal, t.tax_amount, t.total,
+           substr(trim(COALESCE(t.description, ''), ' ' || char(9, 10, 13)), 1, 120) as description_summary,
+           COALESCE(c.name, 'N/A') as customer_name,
+           COALESCE(NULLIF(trim(COALESCE(b.make, '') || ' ' || COALESCE(b.model, '')), ''), 'N/A') as boat_label,
+           e.engine_type as engine_type,
+           CASE WHEN t.engine_id IS NULL THEN 'N/A' ELSE trim(
+               COALESCE(e.year || ' ', '') || COALESCE(NULLIF(e.make, '') || ' ', '')
+               || COALESCE(NULLIF(e.model, '') || ' ', '')
+               || CASE WHEN e.hp THEN e.hp || 'HP ' ELSE '' END || COALESCE(e.engine_type, '')
+               || CASE WHEN e.engine_type LIKE '%sterndrive%' AND e.outdrive <> ''
+                       THEN ' (' || e.outdrive || ')' ELSE '' END)
+           END as engine_summary
+    FROM Tickets t
+    LEFT JOIN Customers c ON t.customer_id = c.customer_id
+    LEFT JOIN Boats b ON t.boat_id = b.boat_id
+    LEFT JOIN Engines e ON t.engine_id = e.engine_id
+    {where}
+    ORDER BY t.date_opened DESC, t.ticket_id DESC
+"""
+_LIST_TICKETS_ALL_SQL = _LIST_TICKETS_SQL.format(where='')
+_LIST_TICKETS_STATUS_SQL = _LIST_TICKETS_SQL.format(where='WHERE t.status = ?')
+
+
+def iter_tickets(status: Optional[str] = None, limit: Optional[int] = None,
+                 offset: int = 0) -> Iterator[Dict]:
+    """Yield tickets with customer, boat and engine details as SQLite produces them.
     
-    results = cur.fetchall()
-    conn.close()
-    return results
+    Rows carry every Tickets column except customer_notes, plus display-ready
+    boat_label and engine_summary strings ("Year Make Model HPHP Type (Outdrive)").
+    Newest first, ticket_id breaking ties so LIMIT/OFFSET pages never overlap.
+    """
+    sql, params = (_LIST_TICKETS_STATUS_SQL, (status,)) if status else (_LIST_TICKETS_ALL_SQL, ())
+    if limit is not None:
+        sql, params = sql + " LIMIT ? OFFSET ?", params + (limit, offset)
+    return _iter_query(sql, params)
+
+
+def list_tickets(status: Optional[str] = None, limit: Optional[int] = None,
+                 offset: int = 0) -> List[Dict]:
+    """List tickets (or one page of them when limit is given), optionally filtered by status."""
+    return list(iter_tickets(status, limit, offset))
+
+
+def count_open_tickets() -> int:
+    """Count tickets that are not Closed."""
+    conn = _get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM Tickets WHERE status <> 'Closed'")
+    return cur.fetchone()[0]
 
 
 # ============================================================================
 # DEPOSIT OPERATIONS
 # ============================================================================
 
+_INSERT_DEPOSIT_SQL = """
+    INSERT INTO Deposits (ticket_id, payment_date, amount, payment_method, notes)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_INSERT_DEPOSIT_RETURNING_SQL = _returning(_INSERT_DEPOSIT_SQL, 'deposit_id')
+
+
 def add_deposit(ticket_id: int, amount: float, payment_method: Optional[str] = None,
                notes: Optional[str] = None) -> int:
     """Add deposit/payment to ticket. Returns deposit_id."""
-    payment_date = datetime.now().strftime('%Y-%m-%d')
+    payment_date = _today_iso()
     
     conn = _get_connection()
     cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO Deposits (ticket_id, payment_date, amount, payment_method, notes)
-        VALUES (?, ?, ?, ?, ?)
-    """, (ticket_id, payment_date, amount, payment_method, notes))
-    conn.commit()
-    last_id = cur.lastrowid if cur.lastrowid is not None else 0
+    cur.execute(_INSERT_DEPOSIT_RETURNING_SQL, (ticket_id, payment_date, amount, payment_method, notes))
+    last_id = _inserted_id(cur)
     deposit_id = int(last_id)
-    conn.close()
     return deposit_id
 
 
+def add_deposits(ticket_id: int, deposits: List[Dict]) -> int:
+    """
+    Add several deposits/payments to a ticket in one transaction.
+    
+    Args:
+        ticket_id: Ticket ID
+        deposits: List of dicts with key 'amount' and optionally 'payment_method' and 'notes'
+    
+    Returns:
+        Number of deposits added
+    """
+    payment_date = _today_iso()
+    rows = [(ticket_id, payment_date, d['amount'], d.get('payment_method'), d.get('notes'))
+            for d in deposits]
+    if not rows:
+        return 0
+    
+    with transaction() as conn:
+        conn.executemany(_INSERT_DEPOSIT_SQL, rows)
+    return len(rows)
+
+
 def get_ticket_deposits(ticket_id: int) -> List[Dict]:
     """Get all deposits for a ticket."""
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
     cur.execute("""
         SELECT * FROM Deposits 
         WHERE ticket_id = ? 
         ORDER BY payment_date
     """, (ticket_id,))
-    results = cur.fetchall()
-    conn.close()
+    results = [dict(row) for row in cur.fetchall()]
     return results
 
 
 def calculate_balance_due(ticket_id: int) -> float:
     """Calculate balance due (ticket total - sum of deposits)."""
     conn = _get_connection()
-    conn.row_factory = _dict_factory
     cur = conn.cursor()
     
-    # Get ticket total
-    cur.execute("SELECT total FROM Tickets WHERE ticket_id = ?", (ticket_id,))
+    cur.execute("""
+        SELECT ROUND(COALESCE(t.total, 0)
+                     - COALESCE((SELECT SUM(d.amount) FROM Deposits d
+                                 WHERE d.ticket_id = t.ticket_id), 0), 2) as balance_due
+        FROM Tickets t
+        WHERE t.ticket_id = ?
+    """, (ticket_id,))
     result = cur.fetchone()
     if not result:
-        conn.close()
         return 0.0
     
-    ticket_total = result['total'] or 0.0
+    return result['balance_due']
+
+
+# ============================================================================
+# REPORTS
+# ============================================================================
+
+# Billed (customer rate) and paid (mechanic's hourly rate) labor per mechanic,
+# this week (by ticket open date) and all time
+_MECHANIC_EARNINGS_SQL = """
+    SELECT m.mechanic_id, m.name, m.hourly_rate,
+           COALESCE(SUM(CASE WHEN t.date_opened >= :week_start
+                             THEN ta.hours_worked * ta.labor_rate END), 0) as week_billed,
+           COALESCE(SUM(CASE WHEN t.date_opened >= :week_start
+                             THEN ta.hours_worked * m.hourly_rate END), 0) as week_paid,
+           COALESCE(SUM(ta.hours_worked * ta.labor_rate), 0) as total_billed,
+           COALESCE(SUM(ta.hours_worked * m.hourly_rate), 0) as total_paid
+    FROM Mechanics m
+    LEFT JOIN TicketAssignments ta ON ta.mechanic_id = m.mechanic_id
+    LEFT JOIN Tickets t ON t.ticket_id = ta.ticket_id
+    GROUP BY m.mechanic_id
+    ORDER BY m.name
+"""
+
+
+def get_financial_summary() -> Dict[str, Any]:
+    """
+    Gather the figures for the Financial Reports tab in one read snapshot.
     
-    # Get sum of deposits
-    cur.execute("""
-        SELECT COALESCE(SUM(amount), 0) as total_paid
-        FROM Deposits 
-        WHERE ticket_id = ?
-    """, (ticket_id,))
-    result = cur.fetchone()
-    total_paid = result['total_paid'] or 0.0
+    Returns a dict with monthly_tax (closed tickets opened this month),
+    mechanics (per-mechanic week/all-time billed and paid labor), parts_revenue
+    and parts_cost (closed tickets), and labor_billed and labor_paid (all time).
+    """
+    today = date.today()
+    first_of_month = today.replace(day=1).isoformat()
+    week_start = (today - timedelta(days=today.weekday())).isoformat()
     
-    conn.close()
+    with read_snapshot() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT COALESCE(SUM(tax_amount), 0)
+            FROM Tickets
+            WHERE date_opened >= ? AND status = 'Closed'
+        """, (first_of_month,))
+        monthly_tax = cur.fetchone()[0]
+        
+        cur.execute(_MECHANIC_EARNINGS_SQL, {'week_start': week_start})
+        mechanics = [dict(row) for row in cur.fetchall()]
+        
+        cur.execute("""
+            SELECT 
+                COALESCE(SUM(tp.quantity_used * p.price), 0) as parts_revenue,
+                COALESCE(SUM(tp.quantity_used * COALESCE(p.cost_from_supplier, 0)), 0) as parts_cost
+            FROM TicketParts tp
+            JOIN Parts p ON tp.part_id = p.part_id
+            JOIN Tickets t ON tp.ticket_id = t.ticket_id
+            WHERE t.status = 'Closed'
+        """)
+        parts_revenue, parts_cost = cur.fetchone()
+        
+        cur.execute("""
+            SELECT COALESCE(SUM(ta.hours_worked * ta.labor_rate), 0) as labor_billed,
+                   COALESCE(SUM(ta.hours_worked * m.hourly_rate), 0) as labor_paid
+            FROM TicketAssignments ta
+            LEFT JOIN Mechanics m ON ta.mechanic_id = m.mechanic_id
+        """)
+        labor_billed, labor_paid = cur.fetchone()
     
-    balance_due = round(ticket_total - total_paid, 2)
-    return balance_due
+    return {
+        'monthly_tax': monthly_tax,
+        'mechanics': mechanics,
+        'parts_revenue': parts_revenue,
+        'parts_cost': parts_cost,
+        'labor_billed': labor_billed,
+        'labor_paid': labor_paid,
+    }
 
 
 # ============================================================================
@@ -1329,16 +2321,14 @@ def _cmd_set_notes(args: argparse.Namespace) -> None:
 
 
 def _cmd_append_notes(args: argparse.Namespace) -> None:
-    details = get_ticket_details(args.ticket_id)
-    existing = (details.get('customer_notes') if details else '') or ''
-    combined = (existing + ('\n' if existing else '') + args.notes).strip()
-    set_ticket_notes(args.ticket_id, combined)
+    combined = append_ticket_notes(args.ticket_id, args.notes)
     print("Notes appended:")
-    print(combined)
+    print(combined or '')
 
 
-def cli_main(argv: list[str] | None = None) -> None:
-    """Command-line entry that lives within the service layer."""
+@lru_cache(maxsize=None)
+def _cli_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once; later cli_main calls reuse it."""
     parser = argparse.ArgumentParser(description="Cajun Program CLI")
     sub = parser.add_subparsers(dest='command', required=True)
 
@@ -1351,6 +2341,10 @@ def cli_main(argv: list[str] | None = None) -> None:
     appp.add_argument('ticket_id', type=int)
     appp.add_argument('notes', type=str)
     appp.set_defaults(func=_cmd_append_notes)
+    return parser
+
 
-    args = parser.parse_args(argv)
+def cli_main(argv: list[str] | None = None) -> None:
+    """Command-line entry that lives within the service layer."""
+    args = _cli_parser().parse_args(argv)
     args.func(args)
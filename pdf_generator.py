@@ -1,6 +1,6 @@
 """PDF generation for tickets and estimates using ReportLab."""
 import os
-from datetime import datetime
+from datetime import date
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.lib import colors
@@ -285,7 +285,7 @@ def generate_estimate_pdf(estimate_details, customer, output_path, boat=None, en
     story.append(header_table)
 
     # Info block (estimate date + customer + equipment) within ~1/4 page
-    estimate_date = estimate_details.get('estimate_date', datetime.now().strftime('%Y-%m-%d'))
+    estimate_date = estimate_details.get('estimate_date') or date.today().isoformat()
 
     estimate_info = [
         ['Date', estimate_date],